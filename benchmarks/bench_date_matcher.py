@@ -0,0 +1,76 @@
+"""
+DateRangeMatcher와 기존 이중 루프(타겟 날짜 전체 순회 + any() 중복 검사) 비교
+
+실행: python -m benchmarks.bench_date_matcher [--rows 500] [--dates 60]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from date_matcher import DateRangeMatcher
+
+
+def make_synthetic_rows(row_count, date_count, keyword_count=50, seed=0):
+    """(시작일, 종료일, 키워드, 상품 ID, 순위) 형태의 합성 슬롯 행"""
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1)
+    rows = []
+    for _ in range(row_count):
+        start = base + timedelta(days=rng.randint(-30, date_count))
+        end = start + timedelta(days=rng.randint(0, 60))
+        rows.append((start, end, f"키워드{rng.randrange(keyword_count)}", str(rng.randrange(row_count)),
+                     str(rng.randint(1, 300))))
+    targets = [base + timedelta(days=i) for i in range(date_count)]
+    return rows, targets
+
+
+def legacy_match(rows, target_datetimes):
+    """기존 collect_product_results의 매칭 / 중복 제거 로직"""
+    product_results = {t: [] for t in target_datetimes}
+    for start_date, end_date, row_keyword, product_id, rank_number in rows:
+        for target_datetime in target_datetimes:
+            if start_date <= target_datetime <= end_date:
+                if any(item[0] == row_keyword and item[1] == product_id for item in product_results[target_datetime]):
+                    continue
+                product_results[target_datetime].append((row_keyword, product_id, rank_number))
+    return product_results
+
+
+def matcher_match(rows, target_datetimes):
+    matcher = DateRangeMatcher(target_datetimes)
+    for start_date, end_date, row_keyword, product_id, rank_number in rows:
+        matcher.add(start_date, end_date, row_keyword, product_id, rank_number)
+    return matcher.results
+
+
+def best_of(func, *args, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(sizes):
+    print(f"{'rows':>6} {'dates':>6} {'legacy(ms)':>11} {'matcher(ms)':>12} {'speedup':>8}")
+    for row_count, date_count in sizes:
+        rows, targets = make_synthetic_rows(row_count, date_count)
+        legacy_time, legacy_result = best_of(legacy_match, rows, targets)
+        matcher_time, matcher_result = best_of(matcher_match, rows, targets)
+
+        # 두 방식의 결과가 같아야 함
+        assert legacy_result == matcher_result, "매칭 결과가 다릅니다"
+
+        print(f"{row_count:>6} {date_count:>6} {legacy_time * 1000:>11.2f} {matcher_time * 1000:>12.2f} "
+              f"{legacy_time / matcher_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DateRangeMatcher 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="*", default=[100, 300, 1000])
+    parser.add_argument("--dates", type=int, nargs="*", default=[7, 30, 90])
+    args = parser.parse_args()
+
+    run([(row_count, date_count) for row_count in args.rows for date_count in args.dates])
@@ -0,0 +1,103 @@
+"""
+실제 브라우저 없이 extract_product_results를 실행하기 위한 가짜 WebDriver / 로컬 HTML 서버
+"""
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from web_handler import TABLE_ROWS_SCRIPT
+from wait_utils import TABLE_SIGNATURE_SCRIPT
+from benchmarks.synthetic import render_table_html
+
+
+class FakeElement:
+    def __init__(self, cells=None, href=None):
+        self.cells = cells or []
+        self.href = href
+
+    @property
+    def text(self):
+        return " ".join(self.cells)
+
+    def find_element(self, by, value):
+        # 행 단위 추출 경로용: "./td[12]", "./td[8]//a"
+        index = int(value.split("td[")[1].split("]")[0]) - 1
+        return FakeElement([self.cells[index]], self.href)
+
+    def get_attribute(self, name):
+        return self.href if name == "href" else None
+
+    def is_displayed(self):
+        return True
+
+
+class FakeDriver:
+    """결과 테이블 행을 고정으로 반환하는 드라이버 (호출 수 기록)"""
+
+    def __init__(self, table_rows):
+        self.table_rows = table_rows
+        self.command_count = 0
+
+    def execute_script(self, script, *args):
+        self.command_count += 1
+        if script == TABLE_ROWS_SCRIPT:
+            return [dict(row) for row in self.table_rows]
+        if script == TABLE_SIGNATURE_SCRIPT:
+            return f"{len(self.table_rows)}|"
+        return None
+
+    def find_elements(self, by, value):
+        self.command_count += 1
+        if value == "//tbody/tr":
+            return [FakeElement(row["cells"], row["href"]) for row in self.table_rows]
+        return []
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise LookupError(value)
+        return elements[0]
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def __init__(self, pages, *args, **kwargs):
+        self.pages = pages
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        body = self.pages.get(self.path.split("?")[0], "").encode("utf-8")
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    저장된 HTML(또는 합성 결과 행)을 제공하는 로컬 서버 (HttpFetchBackend 테스트용)
+    with FixtureServer({"/ads": html}) as server: server.url("/ads")
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(_FixtureHandler, pages))
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @classmethod
+    def from_table_rows(cls, table_rows, path="/ads"):
+        return cls({path: render_table_html(table_rows)})
+
+    def url(self, path="/ads"):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,177 @@
+"""
+합성 워크북 / 가짜 드라이버로 주요 단계의 실행 시간을 측정하고 기준값과 비교
+
+실행:
+  python -m benchmarks.run_benchmarks                    # 측정 + 기준값 비교 (회귀 시 종료 코드 1, 기준값 없으면 2)
+  python -m benchmarks.run_benchmarks --update-baseline  # 현재 측정값을 기준값으로 저장
+
+측정값은 PC마다 다르므로 기준값(baseline.json)은 저장소에 넣지 않고, 측정할 PC에서 먼저 한 번 만들어 둡니다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from excel_handler import (
+    SheetIndex,
+    GapMatrix,
+    sync_date_columns_until_today,
+    get_dates_requiring_update,
+    update_excel_rank,
+)
+from web_handler import extract_product_results
+from fetch_backend import HttpFetchBackend, parse_ads_payload
+from web_handler import collect_records
+from xlsm_patcher import patch_xlsm_cells
+from rank_export import RankMatrix, save_rank_matrix, load_rank_matrix
+from rank_analytics import analyze
+from benchmarks.synthetic import make_workbook, make_table_rows, render_table_html, render_ads_payload
+from benchmarks.fake_driver import FakeDriver, FixtureServer
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (슬롯 행 수, 날짜 열 수)
+DEFAULT_SIZES = [(500, 30), (2000, 90), (5000, 180)]
+RANK_UPDATE_COUNT = 200   # update_excel_rank(기존 방식)로 기록할 셀 수
+
+
+def timed(func, *args, **kwargs):
+    """출력을 숨기고 실행 시간(초)과 결과를 반환"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        return time.perf_counter() - started, result
+
+
+def target_dates_for(date_count, start=datetime(2026, 1, 1)):
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(date_count)]
+
+
+def bench_size(row_count, date_count):
+    results = {}
+    target_dates = target_dates_for(date_count)[-14:]
+
+    # 날짜 열 동기화 (오늘까지 누락된 열 삽입)
+    wb = make_workbook(row_count, date_count)
+    results["sync_date_columns_until_today"], _ = timed(sync_date_columns_until_today, wb['데이터'])
+
+    # 빈 날짜 탐색: 기존 열 단위 스캔 / NumPy 빈칸 행렬
+    wb = make_workbook(row_count, date_count)
+    ws = wb['데이터']
+    results["get_dates_requiring_update"], _ = timed(get_dates_requiring_update, ws)
+    results["gap_matrix"], _ = timed(GapMatrix, ws)
+
+    # 순위 기록: 기존 셀 단위 탐색 / SheetIndex 일괄 기록
+    table_rows = make_table_rows(row_count, target_dates)
+    _, product_results = timed(extract_product_results, FakeDriver(table_rows), target_dates)
+    updates = [(date, item) for date, items in product_results.items() for item in items][:RANK_UPDATE_COUNT]
+
+    def legacy_updates():
+        for date, (keyword, product_id, rank) in updates:
+            update_excel_rank(ws, product_id, keyword, rank, date.strftime('%Y-%m-%d'))
+
+    results["update_excel_rank"], _ = timed(legacy_updates)
+    results["sheet_index_build"], index = timed(SheetIndex, ws)
+    results["apply_ranks"], written_cells = timed(index.apply_ranks, product_results)
+
+    # 결과 테이블 파싱: 가짜 드라이버(일괄 / 행 단위) / 로컬 HTML 서버(HTTP 백엔드)
+    results["extract_product_results"], _ = timed(extract_product_results, FakeDriver(table_rows), target_dates)
+    results["extract_product_results_per_element"], _ = timed(
+        extract_product_results, FakeDriver(table_rows), target_dates, bulk=False)
+
+    with FixtureServer.from_table_rows(table_rows) as server:
+        backend = HttpFetchBackend(base_url=server.url())
+        results["http_fetch_results"], _ = timed(backend.fetch_results, "키워드0", target_dates)
+        backend.close()
+
+    # 응답 캡처 백엔드: 저장된 JSON / HTML 응답 본문을 바로 파싱
+    json_payload = render_ads_payload(table_rows)
+    html_payload = render_table_html(table_rows)
+    results["capture_parse_json"], _ = timed(
+        lambda: collect_records(parse_ads_payload(json_payload, "application/json"), target_dates))
+    results["capture_parse_html"], _ = timed(
+        lambda: collect_records(parse_ads_payload(html_payload, "text/html"), target_dates))
+
+    # 저장: openpyxl 전체 저장 / 시트 XML 패치 저장
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bench_path = os.path.join(tmp_dir, "bench.xlsx")
+        results["wb.save"], _ = timed(wb.save, bench_path)
+        results["xlsm_patch_save"], _ = timed(patch_xlsm_cells, bench_path, '데이터', written_cells)
+
+        # 순위 행렬: 시트 → NumPy / npz 저장·읽기 / 벡터화 분석
+        results["rank_matrix_from_sheet"], matrix = timed(RankMatrix.from_sheet, ws)
+        export_path = os.path.join(tmp_dir, "ranks.npz")
+        results["rank_export_npz"], _ = timed(save_rank_matrix, matrix, export_path)
+        results["rank_load_npz"], _ = timed(load_rank_matrix, export_path)
+        results["rank_analytics"], _ = timed(analyze, matrix)
+
+    return results
+
+
+def run(sizes):
+    report = {}
+    for row_count, date_count in sizes:
+        key = f"{row_count}x{date_count}"
+        print(f"\n[{key}] 행 {row_count}개 × 날짜 {date_count}개")
+        report[key] = bench_size(row_count, date_count)
+        for name, seconds in report[key].items():
+            print(f"  {name:<40} {seconds * 1000:>10.1f} ms")
+    return report
+
+
+def compare_with_baseline(report, baseline, tolerance, min_seconds=0.005):
+    """기준값보다 (1 + tolerance)배 이상 느려진 항목 목록 (아주 짧은 측정은 제외)"""
+    regressions = []
+    for size_key, metrics in report.items():
+        for name, seconds in metrics.items():
+            base = baseline.get(size_key, {}).get(name)
+            if base is None or max(seconds, base) < min_seconds:
+                continue
+            if seconds > base * (1 + tolerance):
+                regressions.append((size_key, name, base, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 성능 벤치마크")
+    parser.add_argument("--sizes", nargs="*", help="행x날짜 (예: 500x30 2000x90)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용 성능 저하 비율 (0.5 = 50%%)")
+    args = parser.parse_args()
+
+    sizes = [tuple(int(v) for v in size.split("x")) for size in args.sizes] if args.sizes else DEFAULT_SIZES
+    report = run(sizes)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값을 저장했습니다: {args.baseline}")
+        return 0
+
+    # 기준값 없이 통과로 끝나면 회귀를 잡지 못하므로 실패로 처리
+    if not os.path.exists(args.baseline):
+        print(f"\n기준값 파일이 없습니다 ({args.baseline}). --update-baseline으로 먼저 생성하세요.")
+        return 2
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(report, baseline, args.tolerance)
+    if regressions:
+        print("\n성능 회귀 발견:")
+        for size_key, name, base, seconds in regressions:
+            print(f"  [{size_key}] {name}: {base * 1000:.1f} ms → {seconds * 1000:.1f} ms")
+        return 1
+
+    print("\n기준값 대비 성능 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
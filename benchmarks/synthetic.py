@@ -0,0 +1,119 @@
+"""
+'데이터' 시트 모양의 합성 워크북과 결과 테이블 행 생성기
+"""
+import json
+import random
+from datetime import datetime, timedelta
+from openpyxl import Workbook
+from excel_handler import HEADER_ROW, DATA_START_ROW, COL_VI_ID, COL_KEYWORD, COL_BV
+from config import CAPTURE_FIELD_MAP, RESULT_PAGE_SIZE
+
+
+def make_workbook(row_count, date_count, fill_ratio=0.8, keyword_count=50,
+                  start_date=datetime(2026, 1, 1), seed=0):
+    """
+    5행 헤더, BV(74)열부터 날짜('1/1' 형식), 날짜 뒤 고정 헤더('직전', '비고'),
+    F열 VI ID, J열 키워드, 날짜 열의 fill_ratio만큼 순위가 채워진 워크북
+    """
+    rng = random.Random(seed)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = '데이터'
+
+    for offset in range(date_count):
+        day = start_date + timedelta(days=offset)
+        ws.cell(row=HEADER_ROW, column=COL_BV + offset).value = f"{day.month}/{day.day}"
+    ws.cell(row=HEADER_ROW, column=COL_BV + date_count).value = "직전"
+    ws.cell(row=HEADER_ROW, column=COL_BV + date_count + 1).value = "비고"
+
+    for i in range(row_count):
+        row = DATA_START_ROW + i
+        ws.cell(row=row, column=COL_VI_ID).value = float(10000000 + i)   # 엑셀에서 읽힌 12345.0 형태
+        ws.cell(row=row, column=COL_KEYWORD).value = f"키워드{i % keyword_count}"
+        for offset in range(date_count):
+            if rng.random() < fill_ratio:
+                ws.cell(row=row, column=COL_BV + offset).value = str(rng.randint(1, 300))
+    return wb
+
+
+def make_table_rows(row_count, target_dates, keyword_count=50, seed=0):
+    """
+    fetch_table_rows와 같은 [{"cells": [...], "href": ...}] 형태의 결과 행
+    종료일 내림차순 (사이트 정렬과 같은 가정)
+    """
+    rng = random.Random(seed)
+    target_datetimes = [datetime.strptime(d, '%Y-%m-%d') for d in target_dates]
+    base = min(target_datetimes)
+    span = (max(target_datetimes) - base).days
+
+    slots = []
+    for i in range(row_count):
+        start = base + timedelta(days=rng.randint(-30, span))
+        end = start + timedelta(days=rng.randint(0, 60))
+        slots.append((start, end, i))
+    slots.sort(key=lambda slot: slot[1], reverse=True)
+
+    rows = []
+    for start, end, i in slots:
+        cells = [""] * 13
+        cells[0] = str(i)
+        cells[5] = f"키워드{i % keyword_count}"
+        cells[7] = "상품 보기"
+        cells[8] = "순위밖" if rng.random() < 0.1 else f"{rng.randint(1, 300)}위"
+        cells[11] = start.strftime('%Y-%m-%d') + " ✔"
+        cells[12] = end.strftime('%Y-%m-%d')
+        rows.append({"cells": cells, "href": f"https://smartstore.example/products?id={10000000 + i}"})
+    return rows
+
+
+def render_table_html(table_rows, page_size=None):
+    """
+    결과 행을 사이트와 같은 구조(tbody/tr/td, td[8] 안의 링크)의 HTML로 변환
+    page_size: 페이지당 행 수 선택 박스의 선택 값 (기본값: 모든 행이 한 페이지에 들어가는 크기)
+    """
+    if page_size is None:
+        page_size = max(RESULT_PAGE_SIZE, len(table_rows) + 1)
+    options = "".join(
+        f'<option value="{size}"{" selected" if size == page_size else ""}>{size}개씩</option>'
+        for size in sorted({20, 50, RESULT_PAGE_SIZE, page_size}))
+
+    body = []
+    for table_row in table_rows:
+        tds = []
+        for idx, text in enumerate(table_row["cells"]):
+            if idx == 7 and table_row["href"]:
+                tds.append(f'<td><a href="{table_row["href"]}">{text}</a></td>')
+            else:
+                tds.append(f"<td>{text}</td>")
+        body.append("<tr>" + "".join(tds) + "</tr>")
+
+    if not body:
+        body.append('<tr><td colspan="13">조회된 정보가 없습니다.</td></tr>')
+
+    return ('<html><head><meta charset="utf-8"></head><body>'
+            + f"<select>{options}</select><table><tbody>"
+            + "".join(body) + "</tbody></table></body></html>")
+
+
+def render_ads_payload(table_rows, field_map=CAPTURE_FIELD_MAP):
+    """결과 행을 CAPTURE_FIELD_MAP 구조의 JSON 응답으로 변환 (응답 캡처 파서 fixture)"""
+    rows = []
+    for table_row in table_rows:
+        cells = table_row["cells"]
+        rows.append({
+            field_map["keyword"]: cells[5],
+            field_map["product_id"]: table_row["href"],
+            field_map["rank"]: cells[8],
+            field_map["start_date"]: cells[11][:10],
+            field_map["end_date"]: cells[12][:10],
+        })
+
+    payload = {}
+    container = payload
+    keys = field_map["rows"].split(".")
+    for key in keys[:-1]:
+        container = container.setdefault(key, {})
+    container[keys[-1]] = rows
+    if field_map.get("total"):
+        payload[field_map["total"]] = len(rows)
+    return json.dumps(payload, ensure_ascii=False)
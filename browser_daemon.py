@@ -0,0 +1,200 @@
+import json
+import os
+import socket
+import time
+from datetime import datetime
+from config import (
+    ACCOUNT,
+    BROWSER_DAEMON_PORT,
+    BROWSER_DAEMON_STATE_PATH,
+    BROWSER_DAEMON_KEEPALIVE_SEC,
+)
+from web_handler import create_driver, login_success_check
+from chrome_cache import manage_chrome_cache
+
+
+# 실행(run)이 데몬 브라우저를 사용하는 동안 존재하는 잠금 파일 (사용 중인 프로세스 PID 기록)
+# 데몬은 잠금 파일이 있으면 페이지 이동이 필요한 로그인 유지 확인을 건너뜀
+BROWSER_DAEMON_LOCK_PATH = BROWSER_DAEMON_STATE_PATH + ".lock"
+
+
+class BrowserDaemonBusyError(Exception):
+    """데몬 크롬이 떠 있지만 연결할 수 없음 (같은 프로필로 새 크롬을 실행할 수 없으므로 실행 중단)"""
+
+
+def _is_port_open(address, timeout=0.5):
+    host, port = address.rsplit(":", 1)
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _is_pid_alive(pid):
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        # 윈도우의 os.kill(pid, 0)은 프로세스를 종료시키므로 핸들로 확인
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def is_daemon_in_use():
+    """
+    잠금 파일이 있고 기록된 PID의 프로세스가 살아 있으면 True
+    강제 종료된 실행이 남긴 잠금 파일은 지우고 False
+    """
+    try:
+        with open(BROWSER_DAEMON_LOCK_PATH, encoding="utf-8") as f:
+            pid = int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError):
+        pid = 0
+
+    if _is_pid_alive(pid):
+        return True
+
+    print(f"종료된 실행(PID {pid})이 남긴 브라우저 데몬 잠금 파일을 삭제합니다.")
+    try:
+        os.remove(BROWSER_DAEMON_LOCK_PATH)
+    except FileNotFoundError:
+        pass
+    return False
+
+
+def _acquire_lock():
+    """잠금 파일을 새로 만들면 True (다른 실행이 먼저 만들었으면 False)"""
+    try:
+        fd = os.open(BROWSER_DAEMON_LOCK_PATH, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(str(os.getpid()))
+    return True
+
+
+def read_daemon_state():
+    if not os.path.exists(BROWSER_DAEMON_STATE_PATH):
+        return None
+    try:
+        with open(BROWSER_DAEMON_STATE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_daemon_running(user_id):
+    """같은 계정의 데몬 크롬이 떠 있는지 (디버깅 포트 응답 여부)"""
+    state = read_daemon_state()
+    return bool(state) and state.get("user_id") == user_id and _is_port_open(state["debugger_address"])
+
+
+def attach_to_daemon(user_id):
+    """
+    같은 계정으로 떠 있는 데몬 크롬에 연결한 드라이버를 반환
+    데몬이 없거나 응답하지 않으면 None (새 크롬 실행 가능)
+    데몬이 떠 있지만 다른 실행이 사용 중이거나 연결에 실패하면 BrowserDaemonBusyError
+    (데몬 크롬이 같은 프로필을 쓰고 있어 새 크롬을 실행할 수 없음)
+    """
+    state = read_daemon_state()
+    if not state or state.get("user_id") != user_id:
+        return None
+
+    address = state["debugger_address"]
+    if not _is_port_open(address):
+        print(f"브라우저 데몬({address})이 응답하지 않습니다. 새 크롬을 실행합니다.")
+        return None
+
+    if is_daemon_in_use() or not _acquire_lock():
+        raise BrowserDaemonBusyError(
+            f"브라우저 데몬({address})을 다른 실행이 사용 중입니다. 끝난 뒤 다시 실행하세요.")
+
+    try:
+        driver = create_driver(user_id, debugger_address=address)
+    except Exception as e:
+        os.remove(BROWSER_DAEMON_LOCK_PATH)
+        raise BrowserDaemonBusyError(
+            f"브라우저 데몬({address}) 연결 실패: {e}. 데몬을 종료한 뒤 다시 실행하세요.") from e
+
+    driver.attached_to_daemon = True
+    print(f"브라우저 데몬({address})에 연결했습니다.")
+    return driver
+
+
+def release_driver(driver):
+    """
+    데몬에 연결한 드라이버는 크롬을 닫지 않고 chromedriver만 종료,
+    직접 실행한 드라이버는 quit
+    """
+    if getattr(driver, "attached_to_daemon", False):
+        try:
+            driver.service.stop()
+        finally:
+            if os.path.exists(BROWSER_DAEMON_LOCK_PATH):
+                os.remove(BROWSER_DAEMON_LOCK_PATH)
+        return
+
+    driver.quit()
+
+
+def run_daemon(account=ACCOUNT, port=BROWSER_DAEMON_PORT, keepalive_sec=BROWSER_DAEMON_KEEPALIVE_SEC):
+    """
+    로그인된 크롬을 원격 디버깅 포트와 함께 계속 띄워 두는 데몬
+    Ctrl+C로 종료
+    """
+    user_id = account["user_id"]
+
+    # 데몬 시작 시에만 캐시 정리 (이후 실행들은 따뜻한 브라우저를 그대로 사용)
+    manage_chrome_cache(user_id)
+    driver = create_driver(user_id, remote_debugging_port=port)
+
+    try:
+        if not login_success_check(driver, account):
+            print(f"[{user_id}] 로그인 실패로 데몬을 종료합니다.")
+            return
+
+        with open(BROWSER_DAEMON_STATE_PATH, "w", encoding="utf-8") as f:
+            json.dump({
+                "user_id": user_id,
+                "debugger_address": f"127.0.0.1:{port}",
+                "pid": os.getpid(),
+                "started_at": datetime.now().isoformat(),
+            }, f, ensure_ascii=False)
+        print(f"브라우저 데몬 실행 중 (127.0.0.1:{port}). 종료하려면 Ctrl+C")
+
+        while True:
+            time.sleep(keepalive_sec)
+
+            # 실행이 브라우저를 사용 중이면 페이지를 건드리지 않음
+            if is_daemon_in_use():
+                continue
+
+            # 세션이 만료됐으면 다시 로그인
+            login_success_check(driver, account)
+
+    except KeyboardInterrupt:
+        print("브라우저 데몬을 종료합니다.")
+    finally:
+        if os.path.exists(BROWSER_DAEMON_STATE_PATH):
+            os.remove(BROWSER_DAEMON_STATE_PATH)
+        driver.quit()
+
+
+if __name__ == "__main__":
+    run_daemon()
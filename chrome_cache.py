@@ -0,0 +1,195 @@
+import os
+import re
+import shutil
+import time
+from config import PROFILE_ROOT_DIR, CHROME_CACHE_POLICY, CHROME_CACHE_BUDGET_MB, CHROME_CACHE_DIRS
+from instrumentation import PROFILER, timed_phase
+from web_handler import delete_chrome_cache
+
+# 지우면 캐시 전체를 다시 만들어야 하는 색인 파일은 삭제 대상에서 제외
+CACHE_INDEX_FILES = {"index", "the-real-index"}
+
+# 캐시 백엔드 구분용 파일 / 폴더 이름
+# blockfile(GPUCache, GrShaderCache 등): index + data_0 ~ data_3 블록 파일이 서로를 참조
+# simple cache(HTTP 캐시, Code Cache): 항목마다 독립된 파일 + index-dir
+BLOCKFILE_MARKER = "data_0"
+SIMPLE_CACHE_MARKER = "index-dir"
+
+MB = 1024 * 1024
+
+
+def _scan_files(path):
+    """path 아래의 모든 파일을 (마지막 사용 시각, 크기, 경로) 목록으로 반환"""
+    files = []
+    stack = [path]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    files.append((max(st.st_atime, st.st_mtime), st.st_size, entry.path))
+            except OSError:
+                continue
+    return files
+
+
+def _cache_kind(path):
+    """폴더가 blockfile 캐시면 "blockfile", simple cache면 "simple", 둘 다 아니면 None"""
+    try:
+        names = set(os.listdir(path))
+    except OSError:
+        return None
+    if BLOCKFILE_MARKER in names:
+        return "blockfile"
+    if SIMPLE_CACHE_MARKER in names:
+        return "simple"
+    return None
+
+
+def _eviction_units(path):
+    """
+    캐시 폴더를 삭제 단위 [(마지막 사용 시각, 크기, 경로), ...]로 나눔
+    - blockfile 캐시: 파일 하나만 지우면 색인이 깨지므로 폴더 전체가 한 단위
+    - simple cache: 항목 파일마다 한 단위 (색인 파일 제외)
+    - 그 밖의 폴더(컴포넌트 / 모델 저장소 등): 바로 아래 파일 / 폴더마다 한 단위
+    """
+    kind = _cache_kind(path)
+    if kind == "blockfile":
+        files = _scan_files(path)
+        if not files:
+            return []
+        return [(max(used for used, _, _ in files), sum(size for _, size, _ in files), path)]
+    if kind == "simple":
+        return [unit for unit in _scan_files(path) if os.path.basename(unit[2]) not in CACHE_INDEX_FILES]
+
+    units = []
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return units
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if _cache_kind(entry.path) is not None:
+                    # Default/Cache/Cache_Data, Code Cache/js 처럼 한 단계 아래에 있는 캐시
+                    units.extend(_eviction_units(entry.path))
+                else:
+                    files = _scan_files(entry.path)
+                    if files:
+                        units.append((max(used for used, _, _ in files), sum(size for _, size, _ in files),
+                                      entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                units.append((max(st.st_atime, st.st_mtime), st.st_size, entry.path))
+        except OSError:
+            continue
+    return units
+
+
+def _evict(path):
+    """삭제 단위 하나를 삭제 (폴더는 이름을 바꾼 뒤 삭제해서, 크롬이 쓰는 중이면 손대지 않고 실패)"""
+    if not os.path.isdir(path):
+        os.remove(path)
+        return
+    evicting_path = path + ".evicting"
+    os.rename(path, evicting_path)
+    shutil.rmtree(evicting_path, ignore_errors=True)
+
+
+def worker_profiles(user_id):
+    """병렬 워커용으로 복제된 프로필 이름 목록 (worker_pool.clone_profile의 {user_id}_worker{N})"""
+    pattern = re.compile(rf"{re.escape(user_id)}_worker\d+")
+    try:
+        names = os.listdir(PROFILE_ROOT_DIR)
+    except OSError:
+        return []
+    return sorted(name for name in names
+                  if pattern.fullmatch(name) and os.path.isdir(os.path.join(PROFILE_ROOT_DIR, name)))
+
+
+def profile_size(path):
+    """폴더 전체 크기 (바이트)"""
+    return sum(size for _, size, _ in _scan_files(path))
+
+
+@timed_phase("cache_cleanup")
+def enforce_cache_budget(user_id, budget_mb=CHROME_CACHE_BUDGET_MB, cache_dirs=CHROME_CACHE_DIRS):
+    """
+    캐시 폴더 합계가 budget_mb를 넘으면 가장 오래 쓰지 않은 삭제 단위(_eviction_units)부터 예산 이하가 될 때까지 삭제
+    프로필 / 캐시 크기와 정리 시간을 {"profile_mb", "cache_mb", "evicted_files", "evicted_mb", "elapsed"}로 반환
+    (evicted_files는 삭제한 단위 수로, blockfile 캐시 폴더 하나도 1개로 셈)
+    """
+    started = time.perf_counter()
+    target_profile_path = os.path.join(PROFILE_ROOT_DIR, user_id)
+
+    if not os.path.exists(target_profile_path):
+        print(f"SKIP: 프로필 폴더가 존재하지 않습니다. ({target_profile_path})")
+        return None
+
+    cache_units = []
+    for sub_folder in cache_dirs:
+        full_folder_path = os.path.join(target_profile_path, sub_folder)
+        # 지난번에 이름만 바꾸고 다 지우지 못한 폴더
+        shutil.rmtree(full_folder_path + ".evicting", ignore_errors=True)
+        if os.path.exists(full_folder_path):
+            cache_units.extend(_eviction_units(full_folder_path))
+
+    cache_size = sum(size for _, size, _ in cache_units)
+    budget = budget_mb * MB
+    evicted_files = 0
+    evicted_size = 0
+
+    if cache_size > budget:
+        # 가장 오래 쓰지 않은 단위부터 삭제
+        cache_units.sort()
+        for _, size, path in cache_units:
+            if cache_size - evicted_size <= budget:
+                break
+            try:
+                _evict(path)
+            except OSError as e:
+                # 보통 크롬이 켜져 있어서 파일이 잠긴 경우
+                print(f"FAIL: {path} / {e}")
+                continue
+            evicted_files += 1
+            evicted_size += size
+
+    report = {
+        "profile_mb": round(profile_size(target_profile_path) / MB, 1),
+        "cache_mb": round((cache_size - evicted_size) / MB, 1),
+        "evicted_files": evicted_files,
+        "evicted_mb": round(evicted_size / MB, 1),
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
+    PROFILER.count("cache_evicted_files", evicted_files)
+    print(f"[Cache] {user_id} 프로필 {report['profile_mb']}MB, 캐시 {report['cache_mb']}MB / 예산 {budget_mb}MB, "
+          f"삭제 {evicted_files}개 ({report['evicted_mb']}MB), {report['elapsed']}초")
+    return report
+
+
+def manage_chrome_cache(user_id, policy=CHROME_CACHE_POLICY):
+    """
+    브라우저 실행 전 설정된 정책으로 캐시 정리 ("budget" / "delete")
+    병렬 워커의 복제 프로필도 실행할 때마다 캐시가 쌓이므로 같은 정책으로 정리하고, 원본 프로필의 결과를 반환
+    """
+    for worker_profile in worker_profiles(user_id):
+        _apply_cache_policy(worker_profile, policy)
+    return _apply_cache_policy(user_id, policy)
+
+
+def _apply_cache_policy(user_id, policy):
+    if policy == "delete":
+        started = time.perf_counter()
+        delete_chrome_cache(user_id)
+        target_profile_path = os.path.join(PROFILE_ROOT_DIR, user_id)
+        if not os.path.exists(target_profile_path):
+            return None
+        return {"profile_mb": round(profile_size(target_profile_path) / MB, 1),
+                "elapsed": round(time.perf_counter() - started, 3)}
+    return enforce_cache_budget(user_id)
@@ -18,4 +18,133 @@ TOP_ADS_URL = "https://top.re.kr/ads"
 TARGET_START_DATE = "2026-01-01"
 
 # 계정 정보
-ACCOUNT = {"user_id": "sstrade251016", "user_pw": "a2345"}
\ No newline at end of file
+ACCOUNT = {"user_id": "sstrade251016", "user_pw": "a2345"}
+# 검색 백엔드 설정
+# "selenium": 브라우저에서 검색 / "http": 로그인 쿠키를 재사용해 HTTP로 검색
+# "capture": 브라우저로 검색하되, 결과 표를 그리는 응답(JSON / HTML)을 DevTools 로그에서 가져와 파싱
+FETCH_BACKEND = "selenium"
+TOP_ADS_SEARCH_PARAM = "search"   # 검색어 쿼리 파라미터 이름
+HTTP_POOL_SIZE = 4
+
+# 응답 캡처 설정 (FETCH_BACKEND = "capture", network_capture.py)
+CAPTURE_URL_PATTERN = r"/ads"            # 결과 표 응답 URL (정규식, 검색 완료 대기에도 사용하므로 JS RegExp로도 해석 가능해야 함)
+CAPTURE_MIME_TYPES = ["json", "html"]
+# JSON 응답의 필드 이름 (CAPTURE_SAVE_DIR로 실제 응답을 저장해 확인 후 맞춰야 함)
+CAPTURE_FIELD_MAP = {
+    "rows": "data",               # 행 목록 위치 (점으로 구분한 경로, 예: "data.list")
+    "total": "total",             # 전체 행 수 (행 목록보다 많으면 여러 페이지이므로 화면에서 읽음)
+    "keyword": "keyword",
+    "product_id": "product_url",  # 상품 번호 또는 "...?id=123" 형태의 링크
+    "rank": "rank",               # 12 / "12위" / "순위밖"
+    "start_date": "start_date",
+    "end_date": "end_date",
+}
+CAPTURE_SAVE_DIR = None   # 경로를 지정하면 캡처한 응답을 파일로 저장 (파서 확인용 fixture)
+
+# 검색 속도 제한 / 재시도 (request_scheduler.py)
+# 계정별 토큰 버킷: 성공하면 SEARCH_RATE_INCREASE씩 올리고, 실패 / 차단 / 응답 지연 시 SEARCH_RATE_DECREASE배로 낮춤
+SEARCH_RATE_INITIAL = 1.0        # 초당 검색 수
+SEARCH_RATE_MIN = 0.1
+SEARCH_RATE_MAX = 5.0
+SEARCH_RATE_BURST = 1            # 한 번에 몰아서 보낼 수 있는 검색 수
+SEARCH_RATE_INCREASE = 0.05
+SEARCH_RATE_DECREASE = 0.5
+SEARCH_SLOWDOWN_FACTOR = 2.0     # 응답 시간이 평소의 N배를 넘으면 사이트가 느려진 것으로 판단
+SEARCH_BACKOFF_BASE_SEC = 2.0    # 재시도 대기: 2, 4, 8 ... 초 (지터 포함, 최대 SEARCH_BACKOFF_MAX_SEC)
+SEARCH_BACKOFF_MAX_SEC = 60.0
+SEARCH_MAX_ATTEMPTS = 3          # 검색어 하나당 최대 시도 횟수
+BLOCKED_STATUS_CODES = [403, 429, 503]   # 차단 / 제한으로 보는 HTTP 상태 코드
+LOGIN_MAX_RETRIES = 3
+
+# 병렬 검색 설정 (1이면 드라이버 하나로 순차 검색)
+SCRAPE_CONCURRENCY = 1
+
+# 검색 / 기록 파이프라인 (pipeline.py)
+# True면 검색 결과를 크기 제한 큐에 넣고 기록 스레드 하나가 저장소 기록 / 엑셀 중간 저장을 처리
+# (저널은 큐에 넣기 전에 기록하므로 큐에 남은 결과도 --resume으로 복구됨)
+# 큐가 가득 차면 검색이 잠시 멈춰서 메모리 사용량이 일정하게 유지됨
+PIPELINE_ENABLED = False
+PIPELINE_QUEUE_SIZE = 8
+
+# 여러 계정 동시 실행 목록 (multi_account_runner.py)
+# 계정마다 서로 다른 엑셀 파일(excel_path)을 지정해야 함, sheet_name 기본값은 '데이터'
+ACCOUNTS = [
+    {**ACCOUNT, "excel_path": EXCEL_PATH, "sheet_name": "데이터"},
+]
+
+# 브라우저 데몬 설정 (browser_daemon.py)
+# True면 실행 시 떠 있는 데몬 크롬에 붙고, 데몬이 없으면 평소처럼 새 크롬을 실행
+USE_BROWSER_DAEMON = False
+BROWSER_DAEMON_PORT = 9222
+BROWSER_DAEMON_STATE_PATH = os.path.join(BASE_DIR, "browser_daemon.json")
+BROWSER_DAEMON_KEEPALIVE_SEC = 600
+
+# 브라우저 렌더링 설정 (web_handler.create_driver)
+# HEADLESS: 창 없이 실행 (--headless=new)
+# FAST_RENDER: 순위 표 읽기에 필요 없는 이미지 / 폰트 / 스타일시트 / 미디어 요청을 DevTools로 차단
+# PAGE_LOAD_STRATEGY: "normal"(모든 리소스 로드) / "eager"(DOM 준비되면 반환) / "none"
+HEADLESS = False
+FAST_RENDER = False
+PAGE_LOAD_STRATEGY = "normal"
+BLOCKED_URL_PATTERNS = [
+    # 이미지
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    # 폰트
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # 스타일시트 (레이아웃이 깨져도 표의 텍스트는 그대로 읽힘)
+    "*.css",
+    # 미디어
+    "*.mp4", "*.webm", "*.mp3", "*.m4a",
+]
+
+# 크롬 프로필 캐시 관리 (chrome_cache.py)
+# "budget": HTTP / 코드 캐시는 유지하고, 캐시 폴더 합계가 예산을 넘을 때만 오래된 파일부터 삭제
+# "delete": 실행 전마다 캐시 폴더 전체 삭제 (이전 방식)
+CHROME_CACHE_POLICY = "budget"
+CHROME_CACHE_BUDGET_MB = 300
+CHROME_CACHE_DIRS = [
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "GPUCache"),
+    "component_crx_cache",
+    "GrShaderCache",
+    "optimization_guide_model_store",
+]
+
+# ChromeDriverManager가 설치한 chromedriver 경로 캐시
+CHROMEDRIVER_CACHE_PATH = os.path.join(BASE_DIR, "chromedriver_path.json")
+
+# 로그인 세션 캐시 (session_cache.py)
+SESSION_CACHE_ENABLED = True
+SESSION_EXPIRY_MARGIN_SEC = 600          # 만료 10분 전이면 미리 폐기
+SESSION_DEFAULT_TTL_SEC = 12 * 60 * 60   # 만료 시각이 없는 세션 쿠키의 유효 기간 가정
+
+# 순위 이력 저장소 (rank_store.py)
+RANK_STORE_PATH = os.path.join(BASE_DIR, "rank_history.sqlite3")
+
+# 순위 행렬 내보내기 (rank_export.py / rank_analytics.py)
+# .parquet / .arrow는 pyarrow 필요, 없으면 .npz로 저장
+RANK_EXPORT_PATH = os.path.join(BASE_DIR, "rank_matrix.parquet")
+
+# 검색 쿼리 계획 (query_planner.py)
+# 계정 ID 한 번 검색으로 모든 슬롯을 가져오는 것이 키워드별 검색보다 싸면 계정 검색 사용
+QUERY_PLANNER_ENABLED = True
+RESULT_PAGE_SIZE = 100   # 검색 결과 한 페이지의 행 수 (계정 검색 비용 추정용)
+
+# 검색 결과 페이지 이동 (web_handler.iter_result_rows)
+RESULT_PAGINATION = True
+RESULT_MAX_PAGES = 50
+RESULT_NEXT_PAGE_XPATH = "//*[contains(@class, 'pagination')]//*[self::a or self::button][contains(., '다음') or contains(., '›') or contains(., '>')]"
+RESULT_PAGE_SIZE_SELECT_XPATH = "//select[option[contains(., '100')]]"
+
+# 실행 리포트 (instrumentation.py)
+RUN_REPORT_DIR = os.path.join(BASE_DIR, "run_reports")
+
+# 실행 저널 (run_journal.py)
+# 검색 결과를 한 줄씩 기록해 두고, 중간에 죽으면 --resume으로 이어서 실행
+RUN_JOURNAL_DIR = os.path.join(BASE_DIR, "run_journals")
+JOURNAL_CHECKPOINT_EVERY = 20   # 검색어 N개마다 엑셀에 중간 저장
+
+# 엑셀 저장 방식
+# True: 열 삽입 같은 구조 변경이 없으면 순위 셀이 있는 시트 XML만 고쳐 쓰기 (xlsm_patcher.py)
+XLSM_PATCH_ENABLED = True
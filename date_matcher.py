@@ -0,0 +1,35 @@
+from bisect import bisect_left, bisect_right
+
+
+class DateRangeMatcher:
+    """
+    슬롯 기간(시작일 ~ 종료일)에 포함되는 타겟 날짜를 이분 탐색으로 찾고,
+    날짜별 (키워드, 상품 ID) 중복은 해시 셋으로 제거하며 결과를 모음
+    results: {datetime: [(row_keyword, product_id, rank_number), ...]}
+    """
+
+    def __init__(self, target_datetimes):
+        self.targets = sorted(set(target_datetimes))
+        self.min_target = self.targets[0]
+        self.max_target = self.targets[-1]
+
+        self.results = {target_datetime: [] for target_datetime in target_datetimes}
+        self._seen = set()   # {(datetime, row_keyword, product_id)}
+
+    def dates_in_range(self, start_date, end_date):
+        """start_date <= t <= end_date 인 타겟 날짜 목록 (오름차순)"""
+        lo = bisect_left(self.targets, start_date)
+        hi = bisect_right(self.targets, end_date)
+        return self.targets[lo:hi]
+
+    def add(self, start_date, end_date, row_keyword, product_id, rank_number):
+        """기간에 포함되는 날짜마다 결과를 추가하고, 새로 추가된 날짜 목록을 반환"""
+        added = []
+        for target_datetime in self.dates_in_range(start_date, end_date):
+            key = (target_datetime, row_keyword, product_id)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            self.results[target_datetime].append((row_keyword, product_id, rank_number))
+            added.append(target_datetime)
+        return added
@@ -1,10 +1,269 @@
 import os
+import time
+import numpy as np
 from openpyxl import load_workbook
 from datetime import datetime, timedelta
-from config import EXCEL_PATH
+from config import EXCEL_PATH, XLSM_PATCH_ENABLED
+from instrumentation import PROFILER, timed_phase
+from xlsm_patcher import patch_xlsm_cells, PATCH_ERRORS
 
 
-def get_keyword_from_xlsm():
+# '데이터' 시트 레이아웃
+HEADER_ROW = 5          # 날짜 헤더 행
+DATA_START_ROW = 7      # 슬롯 데이터 시작 행
+COL_VI_ID = 6           # F열
+COL_KEYWORD = 10        # J열
+COL_BV = 74             # 날짜 열 시작 (BV)
+FIXED_HEADER_KEYWORDS = ["직전", "비고", "서식", "공란"]
+
+
+def normalize_vi_id(raw_vi_id):
+    """12345.0 같은 ID 값을 '12345' 형태의 문자열로 통일"""
+    try:
+        return str(int(float(raw_vi_id))) if raw_vi_id else ""
+    except (TypeError, ValueError):
+        return str(raw_vi_id or "").strip()
+
+
+def is_formula(cell_val):
+    """keep_vba 로드(data_only=False) 시 수식 셀은 '=...' 문자열로 읽힘"""
+    return isinstance(cell_val, str) and cell_val.startswith("=")
+
+
+def header_to_month_day(cell_val):
+    """5행 헤더 값(날짜 객체, '1/7', '2026-01-07')을 '1/7' 형태로 변환"""
+    if isinstance(cell_val, datetime):
+        return f"{cell_val.month}/{cell_val.day}"
+
+    cell_str = str(cell_val).strip()
+    try:
+        dt = datetime.strptime(cell_str, '%Y-%m-%d')
+        return f"{dt.month}/{dt.day}"
+    except ValueError:
+        return cell_str
+
+
+class SheetIndex:
+    """
+    '데이터' 시트의 (VI ID, 키워드) → 행, 날짜 헤더 → 열 매핑을 한 번만 만들어 재사용
+    열 삽입은 반드시 insert_cols()로 해야 날짜 열 매핑이 함께 이동합니다.
+    """
+
+    def __init__(self, ws, resolve_formula=None):
+        self.ws = ws
+        self.resolve_formula = resolve_formula  # 수식 셀의 계산값 조회 함수 (row, col) -> value
+        self.row_map = {}        # {('12345', '키워드'): 행 번호}
+        self.date_col_map = {}   # {'1/7': 열 번호}
+        with PROFILER.phase("sheet_index_build"):
+            self._build_row_map()
+            self._build_date_col_map()
+
+    def _build_row_map(self):
+        rows = self.ws.iter_rows(min_row=DATA_START_ROW, min_col=COL_VI_ID, max_col=COL_KEYWORD, values_only=True)
+        for row_idx, values in enumerate(rows, start=DATA_START_ROW):
+            PROFILER.count("cells_read", len(values))
+            raw_vi_id = values[0]
+            raw_keyword = values[COL_KEYWORD - COL_VI_ID]
+            if self.resolve_formula is not None:
+                if is_formula(raw_vi_id):
+                    raw_vi_id = self.resolve_formula(row_idx, COL_VI_ID)
+                if is_formula(raw_keyword):
+                    raw_keyword = self.resolve_formula(row_idx, COL_KEYWORD)
+
+            vi_id = normalize_vi_id(raw_vi_id)
+            keyword = str(raw_keyword or "").strip()
+
+            # 같은 (ID, 키워드)가 여러 행이면 기존 로직처럼 첫 번째 행에 기록
+            self.row_map.setdefault((vi_id, keyword), row_idx)
+
+    def _build_date_col_map(self):
+        self.date_col_map = {}
+        header_row = self.ws.iter_rows(min_row=HEADER_ROW, max_row=HEADER_ROW, min_col=COL_BV,
+                                       max_col=max(self.ws.max_column, COL_BV), values_only=True)
+        for col, cell_val in enumerate(next(header_row), start=COL_BV):
+            if cell_val is None:
+                continue
+            self.date_col_map.setdefault(header_to_month_day(cell_val), col)
+
+    def insert_cols(self, idx, amount=1):
+        """시트에 열을 삽입하고, 삽입 위치 이후의 날짜 열 번호를 함께 이동"""
+        self.ws.insert_cols(idx, amount)
+        for header, col in self.date_col_map.items():
+            if col >= idx:
+                self.date_col_map[header] = col + amount
+
+    def set_date_header(self, col, date_header):
+        """5행에 날짜 헤더를 쓰고 매핑에 등록"""
+        self.ws.cell(row=HEADER_ROW, column=col).value = date_header
+        self.date_col_map.setdefault(header_to_month_day(date_header), col)
+
+    @staticmethod
+    def search_header(target_date):
+        """'2026-01-07' 또는 datetime 객체를 5행 헤더 형식('1/7')으로 변환"""
+        if not isinstance(target_date, datetime):
+            target_date = datetime.strptime(target_date, '%Y-%m-%d')
+        return f"{target_date.month}/{target_date.day}"
+
+    def col_for_date(self, target_date):
+        """날짜에 해당하는 날짜 열 번호 (없으면 None)"""
+        return self.date_col_map.get(self.search_header(target_date))
+
+    def row_for(self, vi_id, keyword):
+        return self.row_map.get((normalize_vi_id(vi_id), str(keyword or "").strip()))
+
+    def _is_empty(self, row, col):
+        # ws.cell은 없는 셀을 새로 만들기 때문에 내부 셀 사전에서 확인
+        cell = self.ws._cells.get((row, col))
+        return cell is None or cell.value is None or str(cell.value).strip() == ""
+
+    def apply_ranks(self, product_results, only_cells=None):
+        """
+        extract_product_results 결과({datetime: [(kw, id, rank), ...]})를 한 번에 기록
+        값이 있는 셀은 덮어쓰지 않음 (현재 표시 순위로 지난 이력을 바꾸지 않도록)
+        only_cells: {(row, 'YYYY-MM-DD'), ...}가 주어지면 그 셀에만 기록 (GapMatrix.gap_cells)
+        기록된 셀 목록 [(row, col, rank), ...]을 반환
+        """
+        written = []
+        skipped = 0
+        for target_date, items in product_results.items():
+            if not items:
+                continue
+            date_text = target_date.strftime('%Y-%m-%d') if isinstance(target_date, datetime) else target_date
+
+            target_col = self.col_for_date(target_date)
+            if not target_col:
+                print(f"엑셀에서 {self.search_header(target_date)} 열을 찾지 못했습니다.")
+                continue
+
+            for row_keyword, product_id, rank_number in items:
+                row = self.row_for(product_id, row_keyword)
+                if row is None:
+                    continue
+                if (only_cells is not None and (row, date_text) not in only_cells) \
+                        or not self._is_empty(row, target_col):
+                    skipped += 1
+                    continue
+                self.ws.cell(row=row, column=target_col).value = rank_number
+                written.append((row, target_col, rank_number))
+
+        PROFILER.count("cells_written", len(written))
+        if written:
+            print(f"성공: {len(written)}개 셀에 순위 입력")
+        if skipped:
+            print(f"값이 있거나 기록 대상 빈칸이 아닌 셀 {skipped}개는 건너뛰었습니다.")
+        return written
+
+
+class WorkbookSession:
+    """
+    .xlsm 파일을 한 번만 로드해서 키워드 / 헤더 / 누락 날짜 조회와 순위 기록을 함께 처리
+    수식 셀의 계산값이 실제로 필요할 때만 data_only 뷰를 지연 로드합니다.
+    """
+
+    def __init__(self, excel_path=EXCEL_PATH, sheet_name='데이터'):
+        self.excel_path = excel_path
+        self.sheet_name = sheet_name
+
+        # keep_vba=True: 매크로 유지
+        with PROFILER.phase("workbook_load"):
+            self.wb = load_workbook(excel_path, keep_vba=True)
+        self.ws = self.wb[sheet_name]
+
+        self._values_wb = None
+        self._index = None
+        self.structure_changed = False   # 열 삽입 등 셀 값 이외의 변경 여부 (시트 XML 패치 불가)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def values_ws(self):
+        """data_only=True 뷰 (수식 대신 마지막으로 저장된 계산값), 처음 필요할 때 로드"""
+        if self._values_wb is None:
+            print("수식 셀 계산값을 읽기 위해 data_only 뷰를 불러옵니다...")
+            with PROFILER.phase("workbook_load_values"):
+                self._values_wb = load_workbook(self.excel_path, data_only=True)
+        return self._values_wb[self.sheet_name]
+
+    def cell_value(self, row, col):
+        """셀 값을 반환하되, 수식 셀이면 계산값을 반환"""
+        value = self.ws.cell(row=row, column=col).value
+        if is_formula(value):
+            return self.values_ws.cell(row=row, column=col).value
+        return value
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = SheetIndex(self.ws, resolve_formula=self.cell_value)
+        return self._index
+
+    def get_keywords(self):
+        """J열(7행~)의 키워드 집합"""
+        keywords = set()
+        rows = self.ws.iter_rows(min_row=DATA_START_ROW, min_col=COL_KEYWORD, max_col=COL_KEYWORD, values_only=True)
+        for row_idx, (cell_value,) in enumerate(rows, start=DATA_START_ROW):
+            if is_formula(cell_value):
+                cell_value = self.cell_value(row_idx, COL_KEYWORD)
+
+            if cell_value is None:
+                continue
+
+            keyword = str(cell_value).strip()
+            if keyword:
+                keywords.add(keyword)
+
+        print(f"키워드 추출: {list(keywords)}")
+        return keywords
+
+    def sync_date_columns(self, start_date_str="2026-01-01"):
+        added, elapsed = sync_date_columns_until_today(self.ws, start_date_str, index=self._index)
+        if added:
+            self.structure_changed = True
+        return added, elapsed
+
+    def get_header_dates(self):
+        return get_all_date_texts_from_header(self.ws)
+
+    def get_dates_requiring_update(self):
+        return get_dates_requiring_update(self.ws)
+
+    def gap_matrix(self):
+        """행 × 날짜 빈칸 행렬 (호출 시점의 시트 기준)"""
+        return GapMatrix(self.ws, resolve_formula=self.cell_value)
+
+    @timed_phase("workbook_save")
+    def save(self, written_cells=None):
+        """
+        written_cells([(row, col, value), ...])가 주어지고 구조 변경이 없으면
+        시트 XML만 고쳐 쓰는 빠른 저장, 그 외에는 openpyxl로 전체 저장
+        """
+        if XLSM_PATCH_ENABLED and written_cells is not None and not self.structure_changed:
+            try:
+                patch_xlsm_cells(self.excel_path, self.sheet_name, written_cells)
+                return
+            except PATCH_ERRORS as e:
+                print(f"시트 XML 패치 저장 실패, 전체 저장으로 전환합니다: {e}")
+
+        self.wb.save(self.excel_path)
+        # 저장된 파일에 열 구조가 반영되었으므로 다음 저장부터는 XML 패치 가능
+        self.structure_changed = False
+
+    def close(self):
+        self.wb.close()
+        if self._values_wb is not None:
+            self._values_wb.close()
+            self._values_wb = None
+
+
+def get_keyword_from_xlsm(session=None):
+    # 이미 열린 세션이 있으면 파일을 다시 읽지 않음
+    if session is not None:
+        return session.get_keywords()
+
     if not os.path.exists(EXCEL_PATH):
         print(f"파일을 찾을 수 없습니다: {EXCEL_PATH}")
         return set()
@@ -38,59 +297,64 @@ def get_keyword_from_xlsm():
 
 
 # 2026-01-01부터 날짜 열 확인 및 추가
-def sync_date_columns_until_today(ws, start_date_str="2026-01-01"):
+@timed_phase("sync_date_columns")
+def sync_date_columns_until_today(ws, start_date_str="2026-01-01", index=None):
     """
     1월 1일부터 오늘까지 누락된 날짜 열을 5행에 자동으로 추가
     고정 필드를 유지하기 위해 열을 삽입(Insert)하며 확장
+    5행을 한 번만 읽어 누락 날짜를 모은 뒤, 한 번의 insert_cols로 묶어서 삽입
+    (추가된 열 수, 소요 시간(초))를 반환
     """
+    started = time.perf_counter()
+
     # 날짜 범위 설정
     start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
     today = datetime.now()
 
-    # 날짜를 넣기 시작할 시작 열 (BV = 74)
-    start_search_col = 74
+    # 5행 헤더를 BV열(74)부터 한 번에 읽기
+    header_values = next(ws.iter_rows(min_row=HEADER_ROW, max_row=HEADER_ROW, min_col=COL_BV,
+                                      max_col=max(ws.max_column, COL_BV), values_only=True))
+
+    existing_headers = {header_to_month_day(val) for val in header_values if val is not None}
 
-    # 1월 1일부터 오늘까지 반복하며 날짜 확인
+    # '비고'나 '서식' 같은 고정 헤더가 시작되는 위치 (빈칸 포함)
+    target_col = COL_BV
+    for val in header_values:
+        if val is None or any(kw in str(val) for kw in FIXED_HEADER_KEYWORDS):
+            break
+        target_col += 1
+
+    # 1월 1일부터 오늘까지 누락된 날짜 수집 (날짜 순서 유지)
+    missing_headers = []
     current_date = start_date
     while current_date <= today:
         date_header = f"{current_date.month}/{current_date.day}"
-        is_exist = False    # 5행에서 해당 날짜가 이미 있는지 확인
-
-        # cell_val = ws.cell(row=5, column=74).value
+        if date_header not in existing_headers:
+            missing_headers.append(date_header)
+        current_date += timedelta(days=1)
 
-        # 현재 5행에 해당 날짜가 이미 있는지 끝까지 검사
-        last_col = ws.max_column
-        for col in range(start_search_col, last_col+1):
-            cell_val = ws.cell(row=5, column=col).value
-            if cell_val is None:
-                continue
+    if missing_headers:
+        # 누락된 날짜 열을 고정 필드 직전에 한 번에 삽입
+        if index is not None:
+            index.insert_cols(target_col, len(missing_headers))
+        else:
+            ws.insert_cols(target_col, len(missing_headers))
 
-            # 날짜 (객체 또는 문자열) 비교
-            if isinstance(cell_val, datetime):
-                check_str = f"{cell_val.month}/{cell_val.day}"
+        for offset, date_header in enumerate(missing_headers):
+            col = target_col + offset
+            if index is not None:
+                index.set_date_header(col, date_header)
             else:
-                check_str = str(cell_val).strip()
-
-            if check_str == date_header:
-                is_exist = True
-                break
-
-        # 날짜가 없으면 "가장 오른쪽 끝" 혹은 "특정 고정필드 직전"에 추가
-        if not is_exist:
-            # '비고'나 '서식' 같은 고정 헤더가 시작되는 위치를 찾음
-            target_col = start_search_col
-            while True:
-                val = ws.cell(row=5, column=target_col).value
-                # 빈칸이거나 고정 키워드가 나오면 그 자리에 삽입
-                if val is None or any(kw in str(val) for kw in ["직전", "비고", "서식", "공란"]):
-                    break
-                target_col += 1
-
-            ws.insert_cols(target_col)
-            ws.cell(row=5, column=target_col).value = date_header
-            print(f"새 열 추가됨: {target_col}번째 열 ({date_header})")
+                ws.cell(row=HEADER_ROW, column=col).value = date_header
 
-        current_date += timedelta(days=1)
+    elapsed = time.perf_counter() - started
+    if missing_headers:
+        print(f"새 열 {len(missing_headers)}개 추가됨: {target_col}~{target_col + len(missing_headers) - 1}번째 열 "
+              f"({missing_headers[0]} ~ {missing_headers[-1]}), {elapsed:.2f}초 소요")
+    else:
+        print(f"추가할 날짜 열이 없습니다. ({elapsed:.2f}초 소요)")
+
+    return len(missing_headers), elapsed
 
 
 
@@ -155,7 +419,12 @@ def get_missing_dates_for_keyword(ws, keyword, date_info_map):
     return list(missing_dates)
 
 
-def update_excel_rank(ws, target_vi_id, target_keyword, rank_value, target_date):
+def update_excel_rank(ws, target_vi_id, target_keyword, rank_value, target_date, index=None):
+    # 인덱스가 있으면 시트를 다시 훑지 않고 바로 기록
+    if index is not None:
+        index.apply_ranks({target_date: [(target_keyword, target_vi_id, rank_value)]})
+        return
+
     # 5행에서 날짜에 해당하는 열 번호 찾기
     target_col = None
     # 날짜 입력 형식을 안전하게 변환
@@ -204,6 +473,7 @@ def update_excel_rank(ws, target_vi_id, target_keyword, rank_value, target_date)
         pass
 
 
+@timed_phase("get_dates_requiring_update")
 def get_dates_requiring_update(ws):
     """
     5행의 날짜 열들을 순회하며, 해당 열 전체(7행~마지막행)에
@@ -252,4 +522,141 @@ def get_dates_requiring_update(ws):
     else:
         print("모든 날짜 열에 최소 하나 이상의 데이터가 기록되어 있습니다.")
 
-    return dates_to_update
\ No newline at end of file
+    return dates_to_update
+
+def header_to_date_text(cell_val):
+    """5행 헤더 값을 'YYYY-MM-DD'로 변환 ('1/7' 형식은 올해 날짜로 간주), 변환할 수 없으면 None"""
+    if isinstance(cell_val, datetime):
+        return cell_val.strftime('%Y-%m-%d')
+
+    cell_str = str(cell_val).strip()
+    for fmt, text in (('%Y-%m-%d', cell_str), ("%Y/%m/%d", f"{datetime.now().year}/{cell_str}")):
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+
+def read_cell_block(ws, min_row, max_row, min_col, max_col):
+    """
+    시트의 사각 영역 값을 (행, 열) object 배열로 한 번에 읽기 (빈 셀은 None)
+    iter_rows / ws.cell은 없는 셀을 새로 만들기 때문에, 이미 존재하는 셀만 순회
+    """
+    block = np.full((max_row - min_row + 1, max_col - min_col + 1), None, dtype=object)
+    PROFILER.count("cells_read", block.size)
+
+    cells = getattr(ws, "_cells", None)
+    if cells is None:
+        # 읽기 전용 시트 등 내부 셀 사전이 없는 경우
+        for i, row in enumerate(ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col,
+                                             max_col=max_col, values_only=True)):
+            block[i, :len(row)] = row
+        return block
+
+    for (row, col), cell in cells.items():
+        if min_row <= row <= max_row and min_col <= col <= max_col:
+            block[row - min_row, col - min_col] = cell.value
+    return block
+
+
+def find_date_columns(ws, until=None):
+    """
+    5행 헤더에서 고정 헤더 전까지의 날짜 열 (until 이후 날짜 제외, 기본값은 오늘)
+    ([열 번호, ...], ['YYYY-MM-DD', ...])를 반환
+    """
+    until = (until or datetime.now()).strftime('%Y-%m-%d')
+
+    header_values = next(ws.iter_rows(min_row=HEADER_ROW, max_row=HEADER_ROW, min_col=COL_BV,
+                                      max_col=max(ws.max_column, COL_BV), values_only=True))
+    date_cols = []
+    date_texts = []
+    for col, cell_val in enumerate(header_values, start=COL_BV):
+        if cell_val is None or any(kw in str(cell_val) for kw in FIXED_HEADER_KEYWORDS):
+            break
+        date_text = header_to_date_text(cell_val)
+        if date_text and date_text <= until:
+            date_cols.append(col)
+            date_texts.append(date_text)
+    return date_cols, date_texts
+
+
+class GapMatrix:
+    """
+    슬롯 행 × 날짜 열의 빈칸 여부 행렬 (NumPy)
+    시트를 iter_rows로 한 번에 읽어 만들고, 키워드별로 실제로 비어 있는 날짜만 계획으로 반환
+    ID나 키워드가 없는 행은 기록할 수 없으므로 제외
+    """
+
+    @timed_phase("gap_matrix")
+    def __init__(self, ws, resolve_formula=None, until=None):
+        date_cols, date_texts = find_date_columns(ws, until)
+
+        self.date_texts = np.array(date_texts, dtype=object)
+        self.rows = np.zeros(0, dtype=int)
+        self.vi_ids = np.zeros(0, dtype=object)
+        self.keywords = np.zeros(0, dtype=object)
+        self.empty = np.zeros((0, len(date_cols)), dtype=bool)
+
+        if not date_cols or ws.max_row < DATA_START_ROW:
+            return
+
+        # F열 ~ 마지막 날짜 열을 한 번에 읽기
+        values = read_cell_block(ws, DATA_START_ROW, ws.max_row, COL_VI_ID, max(date_cols))
+        row_numbers = np.arange(DATA_START_ROW, DATA_START_ROW + len(values))
+
+        raw_vi_ids = values[:, 0]
+        raw_keywords = values[:, COL_KEYWORD - COL_VI_ID]
+        if resolve_formula is not None:
+            for i in np.flatnonzero(np.frompyfunc(is_formula, 1, 1)(raw_keywords).astype(bool)):
+                raw_keywords[i] = resolve_formula(row_numbers[i], COL_KEYWORD)
+            for i in np.flatnonzero(np.frompyfunc(is_formula, 1, 1)(raw_vi_ids).astype(bool)):
+                raw_vi_ids[i] = resolve_formula(row_numbers[i], COL_VI_ID)
+
+        vi_ids = np.frompyfunc(normalize_vi_id, 1, 1)(raw_vi_ids)
+        keywords = np.frompyfunc(lambda v: str(v or "").strip(), 1, 1)(raw_keywords)
+        valid = (vi_ids != "") & (keywords != "")
+
+        rank_values = values[:, np.array(date_cols) - COL_VI_ID]
+        empty = np.frompyfunc(lambda v: v is None or str(v).strip() == "", 1, 1)(rank_values).astype(bool)
+
+        self.rows = row_numbers[valid]
+        self.vi_ids = vi_ids[valid]
+        self.keywords = keywords[valid]
+        self.empty = empty[valid]
+
+    def dates_with_gaps(self):
+        """한 행이라도 비어 있는 날짜 목록"""
+        return list(self.date_texts[self.empty.any(axis=0)])
+
+    def gap_cells(self):
+        """비어 있는 셀 {(row, 'YYYY-MM-DD'), ...} (SheetIndex.apply_ranks의 기록 대상)"""
+        row_idx, date_idx = np.nonzero(self.empty)
+        return set(zip(self.rows[row_idx].tolist(), self.date_texts[date_idx].tolist()))
+
+    def pairs_with_gaps(self):
+        """빈칸이 하나라도 있는 행의 {(keyword, vi_id), ...}"""
+        has_gap = self.empty.any(axis=1)
+        return set(zip(self.keywords[has_gap], self.vi_ids[has_gap]))
+
+    def keyword_plan(self):
+        """빈칸이 있는 키워드별 날짜 계획 {keyword: ['2026-01-07', ...]} (날짜 오름차순)"""
+        if not len(self.rows):
+            return {}
+
+        unique_keywords, codes = np.unique(self.keywords.astype(str), return_inverse=True)
+        gaps_by_keyword = np.zeros((len(unique_keywords), len(self.date_texts)), dtype=bool)
+        np.logical_or.at(gaps_by_keyword, codes, self.empty)
+
+        order = np.argsort(self.date_texts.astype(str))
+        plan = {}
+        for keyword, gaps in zip(unique_keywords, gaps_by_keyword[:, order]):
+            if gaps.any():
+                plan[str(keyword)] = list(self.date_texts[order][gaps])
+        return plan
+
+    def print_summary(self):
+        plan = self.keyword_plan()
+        gap_count = int(self.empty.sum())
+        print(f"빈칸 {gap_count}개 / 행 {len(self.rows)}개 × 날짜 {len(self.date_texts)}개, "
+              f"검색 대상 키워드 {len(plan)}개")
@@ -0,0 +1,312 @@
+import json
+import os
+import sys
+import requests
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from config import (
+    TOP_ADS_URL,
+    TOP_ADS_SEARCH_PARAM,
+    HTTP_POOL_SIZE,
+    FETCH_BACKEND,
+    CAPTURE_URL_PATTERN,
+    CAPTURE_FIELD_MAP,
+    CAPTURE_SAVE_DIR,
+    BLOCKED_STATUS_CODES,
+    RESULT_PAGE_SIZE,
+    RESULT_NEXT_PAGE_XPATH,
+    RESULT_PAGE_SIZE_SELECT_XPATH,
+)
+from instrumentation import PROFILER
+from web_handler import (
+    search_keyword,
+    extract_product_results,
+    collect_product_results,
+    collect_records,
+    iter_records,
+    is_empty_result_row,
+    table_row_to_record,
+    parse_rank_text,
+)
+from network_capture import clear_performance_log, capture_responses, save_payload
+from request_scheduler import SearchFailedError
+
+
+class SeleniumFetchBackend:
+    """브라우저에서 키워드를 검색하고 결과 테이블을 읽는 기본 백엔드"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def fetch_results(self, keyword, target_dates):
+        if not search_keyword(self.driver, keyword):
+            raise SearchFailedError(keyword, "검색창 / 검색 버튼 처리 실패")
+        return extract_product_results(self.driver, target_dates, keyword=keyword)
+
+    def close(self):
+        pass
+
+
+def parse_result_page(page_html):
+    """결과 페이지 HTML → (행 목록, 다음 페이지가 있는지)"""
+    tree = lxml_html.fromstring(page_html)
+    table_rows = _table_rows_from_tree(tree)
+    return table_rows, _has_more_pages(tree, len(table_rows))
+
+
+def _has_more_pages(tree, row_count):
+    """
+    활성화된 다음 페이지 버튼이 있거나, 행 수가 한 페이지 크기만큼 차 있으면 True
+    (HTML 한 페이지만으로는 전체 결과라고 볼 수 없는 경우)
+    """
+    for button in tree.xpath(RESULT_NEXT_PAGE_XPATH):
+        parent = button.getparent()
+        classes = (button.get("class") or "") + " " + (parent.get("class") or "" if parent is not None else "")
+        if button.get("disabled") is None and "disabled" not in classes:
+            return True
+
+    page_size = RESULT_PAGE_SIZE
+    for select in tree.xpath(RESULT_PAGE_SIZE_SELECT_XPATH):
+        selected = select.xpath("./option[@selected]/@value") or select.xpath("./option/@value")
+        if selected and selected[0].isdigit():
+            page_size = int(selected[0])
+    return row_count >= page_size
+
+
+def _table_rows_from_tree(tree):
+    table_rows = []
+    for tr in tree.xpath("//tbody/tr"):
+        tds = tr.xpath("./td")
+        links = tds[7].xpath(".//a/@href") if len(tds) > 7 else []
+        table_rows.append({
+            "cells": [td.text_content().strip() for td in tds],
+            "href": links[0] if links else None,
+        })
+    return table_rows
+
+
+class HttpFetchBackend:
+    """
+    로그인된 Selenium 세션의 쿠키로 HTTP 세션을 만들어 브라우저 렌더링 없이 검색
+    결과 테이블이 HTML에 없으면(클라이언트 렌더링) fallback 백엔드로 검색하고,
+    이후 검색도 HTTP 요청 없이 바로 fallback 백엔드로 검색합니다.
+    """
+
+    def __init__(self, cookies=None, user_agent=None, base_url=TOP_ADS_URL,
+                 search_param=TOP_ADS_SEARCH_PARAM, pool_size=HTTP_POOL_SIZE, timeout=10, fallback=None):
+        self.base_url = base_url
+        self.search_param = search_param
+        self.timeout = timeout
+        self.fallback = fallback
+        self.use_fallback = False   # 결과 테이블이 없는 응답을 한 번 받으면 True
+
+        # 연결 재사용을 위한 세션 풀
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+
+        for cookie in cookies or []:
+            self.session.cookies.set(cookie["name"], cookie["value"],
+                                     domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """로그인된 드라이버의 쿠키와 User-Agent를 가져와 생성"""
+        cookies = driver.get_cookies()
+        user_agent = driver.execute_script("return navigator.userAgent")
+        kwargs.setdefault("fallback", SeleniumFetchBackend(driver))
+        return cls(cookies=cookies, user_agent=user_agent, **kwargs)
+
+    def fetch_html(self, keyword):
+        PROFILER.count("http_requests")
+        response = self.session.get(self.base_url, params={self.search_param: keyword}, timeout=self.timeout)
+        response.raise_for_status()
+
+        # charset이 없는 응답은 requests가 ISO-8859-1로 간주하므로 UTF-8로 지정 (한글 깨짐 방지)
+        if "charset" not in response.headers.get("Content-Type", "").lower():
+            response.encoding = "utf-8"
+        return response.text
+
+    def fetch_results(self, keyword, target_dates):
+        if self.use_fallback:
+            return self.fallback.fetch_results(keyword, target_dates)
+
+        try:
+            table_rows, more_pages = parse_result_page(self.fetch_html(keyword))
+        except requests.HTTPError as e:
+            # 차단 / 요청 제한 응답은 브라우저로 바꿔도 같으므로 재시도 대상으로 넘김
+            if e.response is not None and e.response.status_code in BLOCKED_STATUS_CODES:
+                raise SearchFailedError(keyword, f"HTTP {e.response.status_code}", blocked=True) from e
+            print(f"키워드 HTTP 검색 중 오류 발생: {e}")
+            if self.fallback is not None:
+                return self.fallback.fetch_results(keyword, target_dates)
+            raise SearchFailedError(keyword, str(e)) from e
+        except requests.RequestException as e:
+            print(f"키워드 HTTP 검색 중 오류 발생: {e}")
+            if self.fallback is not None:
+                return self.fallback.fetch_results(keyword, target_dates)
+            raise SearchFailedError(keyword, str(e)) from e
+
+        # 클라이언트 렌더링 페이지는 키워드와 관계없이 HTML에 표가 없으므로 이번 세션 동안 브라우저 검색 유지
+        if not table_rows and self.fallback is not None:
+            print(f"'{keyword}' HTTP 응답에 결과 테이블이 없어 이후 검색은 모두 브라우저로 진행합니다.")
+            self.use_fallback = True
+            return self.fallback.fetch_results(keyword, target_dates)
+
+        # HTTP 응답은 첫 페이지뿐이므로, 결과가 여러 페이지면 페이지를 넘기며 읽는 브라우저 검색으로 전환
+        if more_pages:
+            if self.fallback is None:
+                raise SearchFailedError(keyword, "결과가 여러 페이지라 HTTP 응답만으로는 읽을 수 없음")
+            print(f"'{keyword}' 결과가 여러 페이지라 브라우저 검색으로 전환합니다.")
+            return self.fallback.fetch_results(keyword, target_dates)
+
+        print(f"'{keyword}' 검색 완료 (HTTP)")
+        return collect_product_results(table_rows, target_dates)
+
+    def close(self):
+        self.session.close()
+
+
+def _get_path(data, path):
+    """"data.list" 같은 점 경로로 JSON 값을 꺼냄"""
+    for key in path.split("."):
+        data = data[int(key)] if isinstance(data, list) else data[key]
+    return data
+
+
+def payload_row_to_record(row, field_map=CAPTURE_FIELD_MAP):
+    """JSON 응답의 행 하나를 table_row_to_record와 같은 레코드로 변환"""
+    product_id = str(row[field_map["product_id"]] or "")
+    if "=" in product_id:
+        # 상품 링크가 오는 경우 화면 파싱과 같게 마지막 '=' 뒤를 상품 번호로 사용
+        product_id = product_id.split("=")[-1]
+
+    rank = row.get(field_map["rank"])
+    if rank is None:
+        rank = ""
+    elif isinstance(rank, str):
+        rank = parse_rank_text(rank.strip()) if "위" in rank else rank.strip()
+    else:
+        rank = str(rank)
+
+    return {
+        "keyword": str(row[field_map["keyword"]]).strip(),
+        "product_id": product_id,
+        "rank": rank,
+        "start_date": str(row[field_map["start_date"]]).strip()[:10],
+        "end_date": str(row[field_map["end_date"]]).strip()[:10],
+    }
+
+
+def parse_ads_payload(body, mime_type="", field_map=CAPTURE_FIELD_MAP):
+    """
+    캡처한 응답 본문(JSON / HTML)을 레코드 목록으로 변환 (브라우저 없이 fixture로 확인 가능)
+    결과 표 응답이 아니거나 여러 페이지 중 일부만 담긴 응답이면 None
+    """
+    text = body.lstrip()
+    if "json" in mime_type or text[:1] in ("{", "["):
+        try:
+            payload = json.loads(text)
+            rows = _get_path(payload, field_map["rows"])
+        except (ValueError, KeyError, IndexError, TypeError):
+            return None
+        if not isinstance(rows, list):
+            return None
+
+        total_field = field_map.get("total")
+        if total_field and isinstance(payload, dict) and isinstance(payload.get(total_field), int):
+            if payload[total_field] > len(rows):
+                print(f"응답에 전체 {payload[total_field]}행 중 {len(rows)}행만 있습니다.")
+                return None
+        records = list(iter_records(rows, lambda row: payload_row_to_record(row, field_map)))
+        if rows and not records:
+            # 필드 이름이 맞지 않으면 모든 행이 실패하므로 빈 결과(검색 완료)로 보지 않음
+            print(f"응답의 {len(rows)}행을 하나도 변환하지 못했습니다. config.CAPTURE_FIELD_MAP을 확인하세요: "
+                  f"{sorted(rows[0]) if isinstance(rows[0], dict) else type(rows[0]).__name__}")
+            return None
+        return records
+
+    table_rows, more_pages = parse_result_page(body)
+    if not table_rows:
+        return None
+    if is_empty_result_row(table_rows[0]):
+        return []
+    if more_pages:
+        # 첫 페이지만 담긴 응답 → 페이지를 넘기며 읽는 화면(DOM) 경로로 넘김
+        print(f"HTML 응답이 여러 페이지 중 첫 페이지({len(table_rows)}행)입니다.")
+        return None
+    records = list(iter_records(table_rows, table_row_to_record))
+    if not records:
+        print(f"HTML 응답의 {len(table_rows)}행을 하나도 변환하지 못했습니다.")
+        return None
+    return records
+
+
+class CaptureFetchBackend:
+    """
+    브라우저로 검색하고, 결과 표를 그리는 응답(JSON / HTML)을 DevTools performance 로그에서 가져와 바로 파싱
+    create_driver(capture_network=True)로 만든 드라이버가 필요하며, 쓸 수 있는 응답이 없으면 화면(DOM)에서 읽음
+    """
+
+    def __init__(self, driver, url_pattern=CAPTURE_URL_PATTERN, field_map=CAPTURE_FIELD_MAP,
+                 save_dir=CAPTURE_SAVE_DIR):
+        self.driver = driver
+        self.url_pattern = url_pattern
+        self.field_map = field_map
+        self.save_dir = save_dir
+
+    def fetch_results(self, keyword, target_dates):
+        clear_performance_log(self.driver)
+        if not search_keyword(self.driver, keyword):
+            raise SearchFailedError(keyword, "검색창 / 검색 버튼 처리 실패")
+
+        # 마지막 응답이 최종 결과이므로 뒤에서부터 확인
+        for url, mime_type, body in reversed(capture_responses(self.driver, self.url_pattern)):
+            if self.save_dir:
+                save_payload(self.save_dir, keyword, url, mime_type, body)
+
+            records = parse_ads_payload(body, mime_type, self.field_map)
+            if records is not None:
+                PROFILER.count("captured_payloads")
+                print(f"'{keyword}' 검색 완료 (응답 캡처: {url})")
+                return collect_records(records, target_dates)
+
+        print(f"'{keyword}' 결과 응답을 찾지 못해 화면에서 읽습니다.")
+        return extract_product_results(self.driver, target_dates, keyword=keyword)
+
+    def close(self):
+        pass
+
+
+def create_fetch_backend(driver, backend_name=FETCH_BACKEND):
+    """config.FETCH_BACKEND 값에 따라 검색 백엔드 생성"""
+    if backend_name == "http":
+        return HttpFetchBackend.from_driver(driver)
+    if backend_name == "capture":
+        return CaptureFetchBackend(driver)
+    return SeleniumFetchBackend(driver)
+
+
+if __name__ == "__main__":
+    # 저장해 둔 응답 fixture를 브라우저 없이 파싱해서 확인
+    # python fetch_backend.py <응답 파일> <YYYY-MM-DD> [<YYYY-MM-DD> ...]
+    if len(sys.argv) < 3:
+        print("사용법: python fetch_backend.py <응답 파일(.json/.html)> <YYYY-MM-DD> [...]")
+        sys.exit(1)
+
+    payload_path = sys.argv[1]
+    with open(payload_path, encoding="utf-8") as f:
+        payload_body = f.read()
+
+    payload_records = parse_ads_payload(payload_body, "json" if payload_path.endswith(".json") else "html")
+    if payload_records is None:
+        print("결과 표 응답으로 인식하지 못했습니다. config.CAPTURE_FIELD_MAP을 확인하세요.")
+        sys.exit(1)
+
+    print(f"레코드 {len(payload_records)}개 ({os.path.basename(payload_path)})")
+    for target_date, items in collect_records(payload_records, sys.argv[2:]).items():
+        print(f" [{target_date:%Y-%m-%d}] {len(items)}건")
@@ -0,0 +1,164 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from config import RUN_REPORT_DIR
+
+
+class RunProfiler:
+    """
+    실행 단계별 / 키워드별 소요 시간과 WebDriver 명령 수, 셀 읽기/쓰기 수를 기록
+    실행이 끝나면 write_report()로 JSON 리포트를 남김
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._started = time.perf_counter()
+            self.phases = {}     # {"search_keyword": {"count": 3, "total": 1.2, "max": 0.5}}
+            self.keywords = {}   # {"키워드": 2.31}
+            self.counters = {}   # {"webdriver_commands": 120, "cells_written": 300}
+            self.browser = {}    # {"키워드": {"js_heap_used_mb": 12.3, "nodes": 4500, ...}}
+
+    def _add_phase(self, name, seconds):
+        with self._lock:
+            info = self.phases.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            info["count"] += 1
+            info["total"] += seconds
+            info["max"] = max(info["max"], seconds)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_phase(name, time.perf_counter() - started)
+
+    @contextmanager
+    def keyword(self, keyword):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.keywords[keyword] = self.keywords.get(keyword, 0.0) + elapsed
+
+    def record_browser(self, keyword, metrics):
+        if metrics is None:
+            return
+        with self._lock:
+            self.browser[keyword] = metrics
+
+    def load_summary(self):
+        """키워드별 소요 시간 / 브라우저 메모리의 평균·최대값 (렌더링 모드별 비교용)"""
+        with self._lock:
+            load_times = list(self.keywords.values())
+            heaps = [m["js_heap_used_mb"] for m in self.browser.values() if "js_heap_used_mb" in m]
+        return {
+            "keywords": len(load_times),
+            # 첫 검색은 캐시 상태(콜드 / 웜)의 영향을 가장 크게 받음
+            "first_load_sec": round(load_times[0], 3) if load_times else None,
+            "avg_load_sec": round(sum(load_times) / len(load_times), 3) if load_times else None,
+            "max_load_sec": round(max(load_times), 3) if load_times else None,
+            "avg_js_heap_mb": round(sum(heaps) / len(heaps), 2) if heaps else None,
+            "max_js_heap_mb": max(heaps) if heaps else None,
+        }
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self, extra=None):
+        load_summary = self.load_summary()
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "elapsed": time.perf_counter() - self._started,
+                "phases": {name: dict(info) for name, info in self.phases.items()},
+                "keywords": dict(self.keywords),
+                "counters": dict(self.counters),
+                "browser": dict(self.browser),
+                "load_summary": load_summary,
+                **(extra or {}),
+            }
+
+    def write_report(self, name="run", extra=None, report_dir=RUN_REPORT_DIR):
+        """run_reports/<name>_YYYYmmdd_HHMMSS.json 파일로 저장하고 경로를 반환"""
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, f"{name}_{self.started_at:%Y%m%d_%H%M%S}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(extra), f, ensure_ascii=False, indent=2, default=str)
+        print(f"실행 리포트 저장: {path}")
+        return path
+
+
+PROFILER = RunProfiler()
+
+
+def timed_phase(name):
+    """함수 실행 시간을 PROFILER의 name 단계로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with PROFILER.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_driver(driver):
+    """WebDriver의 모든 명령(HTTP 왕복)을 PROFILER에 명령 종류별로 집계"""
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        PROFILER.count("webdriver_commands")
+        PROFILER.count(f"webdriver:{driver_command}")
+        return original_execute(driver_command, params)
+
+    driver.execute = execute
+    return driver
+
+
+# Performance.getMetrics 결과 중 리포트에 남길 항목 {CDP 이름: 리포트 이름}
+BROWSER_METRIC_NAMES = {
+    "JSHeapUsedSize": "js_heap_used_mb",
+    "JSHeapTotalSize": "js_heap_total_mb",
+    "Nodes": "nodes",
+    "Documents": "documents",
+    "LayoutCount": "layout_count",
+    "RecalcStyleCount": "recalc_style_count",
+}
+
+
+def sample_browser_metrics(driver):
+    """
+    DevTools Performance.getMetrics로 현재 탭의 메모리 / DOM 지표를 반환
+    크롬이 아니거나 DevTools 명령이 실패하면 None
+    """
+    try:
+        if not getattr(driver, "performance_metrics_enabled", False):
+            driver.execute_cdp_cmd("Performance.enable", {})
+            driver.performance_metrics_enabled = True
+        raw = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except Exception as e:
+        print(f"브라우저 지표 수집 실패: {e}")
+        return None
+
+    metrics = {}
+    for item in raw:
+        name = BROWSER_METRIC_NAMES.get(item["name"])
+        if name is None:
+            continue
+        value = item["value"]
+        metrics[name] = round(value / (1024 * 1024), 2) if name.endswith("_mb") else int(value)
+    return metrics
+
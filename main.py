@@ -1,97 +1,333 @@
+import argparse
 import os
-from openpyxl import load_workbook
-from config import EXCEL_PATH, ACCOUNT  # ACCOUNT는 {"user_id": "...", "user_pw": "..."} 형태
-from excel_handler import (
-    get_keyword_from_xlsm,
-    sync_date_columns_until_today,
-    get_all_date_texts_from_header,
-    update_excel_rank, get_dates_requiring_update
+import time
+from config import (
+    EXCEL_PATH,
+    ACCOUNT,   # {"user_id": "...", "user_pw": "..."} 형태
+    SCRAPE_CONCURRENCY,
+    USE_BROWSER_DAEMON,
+    QUERY_PLANNER_ENABLED,
+    JOURNAL_CHECKPOINT_EVERY,
+    HEADLESS,
+    FAST_RENDER,
+    PAGE_LOAD_STRATEGY,
+    PIPELINE_ENABLED,
 )
+from excel_handler import WorkbookSession
 from web_handler import (
     create_driver,
     login_success_check,
-    search_keyword,
-    extract_product_results,
-    delete_chrome_cache
 )
+from chrome_cache import manage_chrome_cache
+from fetch_backend import create_fetch_backend
+from worker_pool import scrape_keywords_parallel
+from wait_utils import WAIT_STATS
+from browser_daemon import attach_to_daemon, release_driver, is_daemon_running
+from rank_store import RankStore
+from query_planner import plan_queries, check_coverage
+from instrumentation import PROFILER, sample_browser_metrics
+from run_journal import RunJournal
+from pipeline import ResultPipeline
+from request_scheduler import get_rate_limiter, make_search_queue, drain_search_queue
 
 
-def main():
+def run_account(account, excel_path=EXCEL_PATH, sheet_name='데이터', concurrency=SCRAPE_CONCURRENCY, resume=False):
+    """
+    한 계정으로 엑셀의 키워드를 검색해 순위를 기록
+    resume=True: 이전 실행의 저널을 엑셀에 다시 반영하고 완료된 키워드는 건너뜀
+    실행 결과 통계 {"user_id", "keywords", "done", "resumed", "failed", "cells_written", "elapsed", "error"}를 반환
+    (resumed: 저널에서 복구해 이번 실행에서는 검색하지 않은 키워드 수)
+    """
+    PROFILER.reset()
+    started = time.perf_counter()
+    stats = {"user_id": account["user_id"], "excel_path": excel_path, "keywords": 0, "done": 0, "resumed": 0,
+             "failed": [], "cells_written": 0, "elapsed": 0.0, "error": None}
+
     # 엑셀 파일 로드 (매크로 유지를 위해 keep_vba=True)
-    if not os.path.exists(EXCEL_PATH):
-        print(f"파일을 찾을 수 없습니다: {EXCEL_PATH}")
-        return
+    if not os.path.exists(excel_path):
+        print(f"파일을 찾을 수 없습니다: {excel_path}")
+        stats["error"] = "엑셀 파일 없음"
+        return stats
 
+    # 엑셀은 한 번만 로드해서 키워드 / 날짜 조회와 기록에 함께 사용
     print("엑셀 파일을 불러오는 중입니다...")
-    wb = load_workbook(EXCEL_PATH, keep_vba=True)
-    ws = wb['데이터']
+    session = WorkbookSession(excel_path, sheet_name)
 
     # 날짜 열 동기화 (오늘 날짜까지 열이 없으면 생성)
-    sync_date_columns_until_today(ws)
+    session.sync_date_columns()
+
+    # 이전 실행에서 이미 수집한 (키워드, 날짜)는 다시 검색하지 않음
+    store = RankStore()
+
+    # 이전 실행이 중간에 죽어서 남은 저널 처리
+    # 복구된 결과는 저장소에도 기록되므로 완료된 키워드는 아래 filter_pending에서 제외됨
+    journal = RunJournal(account["user_id"])
+    if journal.exists():
+        if resume:
+            stats["resumed"] = len(resume_from_journal(journal, session, store, account["user_id"]))
+        else:
+            print(f">>> 이전 실행의 저널이 남아 있습니다 ({journal.path}). --resume 없이 실행하므로 삭제합니다.")
+            journal.discard()
 
-    # 데이터가 '전혀' 입력되지 않은 날짜 리스트만 추출
-    target_dates = get_dates_requiring_update(ws)
-    if not target_dates:
+    # 행 × 날짜 빈칸 행렬에서 키워드별로 실제로 비어 있는 날짜만 추출
+    gap_matrix = session.gap_matrix()
+    gap_matrix.print_summary()
+    gap_plan = gap_matrix.keyword_plan()
+    if not gap_plan:
         print(">>> 모든 날짜에 데이터가 이미 존재합니다. 추가로 작업할 내용이 없습니다.")
-        wb.close()
-        return
+        journal.discard()
+        store.close()
+        session.close()
+        return stats
 
+    target_dates = gap_matrix.dates_with_gaps()
     print(f">>> 다음 날짜들에 대해 수집을 시작합니다: {target_dates}")
 
-    # 키워드 목록 가져오기
-    keywords = get_keyword_from_xlsm()
-    if not keywords:
-        print("검색할 키워드가 엑셀에 없습니다.")
-        wb.close()
-        return
+    keywords = set(gap_plan)
+    stats["keywords"] = len(keywords)
+
+    # (ID, 키워드) → 행, 날짜 → 열 인덱스를 한 번만 생성
+    sheet_index = session.index
+    done_keywords = set()
+
+    keyword_dates = store.filter_pending(account["user_id"], gap_plan)
+    print(f">>> 검색이 필요한 키워드 {len(keyword_dates)}/{len(keywords)}개")
+
+    # 엑셀에는 빈칸에만 기록하고, 저장소에는 아직 검색하지 않은 (키워드, 날짜)의 결과만 기록
+    # (검색 결과는 현재 순위이므로, 이미 값이 있는 날짜나 계정 검색의 날짜 합집합에 그대로 쓰면 지난 이력을 덮어씀)
+    # 순위밖('')은 전체 저장 시 빈칸이 되므로, 이미 검색한 날짜인지는 저장소의 searches로 구분 (filter_pending)
+    gap_cells = gap_matrix.gap_cells()
+    pending_pairs = {(keyword, date) for keyword, dates in keyword_dates.items() for date in dates}
+
+    # 엑셀에서 채워야 하는 (키워드, VI ID) 행 (계정 검색 커버리지 확인용)
+    needed_pairs = gap_matrix.pairs_with_gaps()
+    queries = {}          # {검색어: SearchQuery}
+    fallback_dates = {}   # 계정 검색 결과에 없어서 키워드로 다시 검색할 {keyword: dates}
+
+    unsaved_results = 0   # 마지막 엑셀 저장 이후 저장소에 기록된 검색어 결과 수
+
+    # 지금까지 저장소에 쌓인 순위를 엑셀에 반영하고 저장 (저널 체크포인트)
+    def save_checkpoint():
+        nonlocal unsaved_results
+        with PROFILER.phase("export"):
+            written_cells = store.export_to_sheet(sheet_index, account["user_id"], target_dates, gap_cells)
+        session.save(written_cells)
+        journal.checkpoint(len(written_cells))
+        unsaved_results = 0
+        return written_cells
+
+    # 검색 결과에서 기록할 부분을 골라 바로 저널에 기록 (항상 메인 스레드, 병렬 워커 모드 포함)
+    # 파이프라인 큐에 넣기 전에 저널에 남겨야 큐에 쌓인 결과도 프로세스가 죽었을 때 --resume으로 복구됨
+    def journal_result(search_text, product_results):
+        query = queries[search_text]
+
+        # product_results가 비었을 때
+        for target_date, items in product_results.items():
+            if not items:
+                print(f" [{target_date.strftime('%Y-%m-%d')}] '{search_text}'에 대한 검색 결과가 없습니다.")
+
+        covered_keywords = list(query.keywords)
+        if query.kind == "account":
+            uncovered_keywords = check_coverage(query, product_results, needed_pairs)
+            for keyword in uncovered_keywords:
+                fallback_dates[keyword] = keyword_dates[keyword]
+            covered_keywords = [keyword for keyword in query.keywords if keyword not in uncovered_keywords]
+
+        # 이번 실행에서 검색이 필요한 (키워드, 날짜)의 결과만 기록
+        product_results = {
+            target_date: [item for item in items if (item[0], target_date.strftime('%Y-%m-%d')) in pending_pairs]
+            for target_date, items in product_results.items()
+        }
+        journal.append(search_text, product_results, covered_keywords)
+        return product_results, covered_keywords
+
+    # 저널에 기록한 결과를 이력 저장소에 기록하고 N개마다 엑셀에 중간 저장
+    # 호출 스레드: PIPELINE_ENABLED면 result-writer 스레드, 아니면 메인 스레드
+    # store / session(중간 저장) / done_keywords는 이 함수를 호출하는 스레드만 다루며,
+    # 파이프라인 모드의 메인 스레드는 pipeline.drain() / close()로 기록이 끝난 뒤에만 접근함
+    def handle_result(search_text, product_results, covered_keywords):
+        nonlocal unsaved_results
+        store.record_results(account["user_id"], search_text, product_results, covered_keywords)
+        done_keywords.update(covered_keywords)
+
+        unsaved_results += 1
+        if unsaved_results >= JOURNAL_CHECKPOINT_EVERY:
+            print(f"\n>>> 검색어 {unsaved_results}개 결과를 엑셀에 중간 저장합니다...")
+            save_checkpoint()
+
+    # 데몬 크롬이 프로필을 쓰고 있으면 병렬 워커용 캐시 정리 / 프로필 복제 / 크롬 실행이 모두 그 프로필과 충돌하므로
+    # 데몬 브라우저 하나로 검색 (사용 중이면 attach_to_daemon이 BrowserDaemonBusyError)
+    if USE_BROWSER_DAEMON and concurrency > 1 and is_daemon_running(account["user_id"]):
+        print(f">>> 브라우저 데몬이 실행 중이라 병렬 검색({concurrency}개) 대신 데몬 브라우저로 검색합니다.")
+        concurrency = 1
+
+    driver = None
+    backend = None
+    pipeline = None
+    # 계정별 검색 속도 제한 (병렬 워커도 같은 것을 공유)
+    limiter = get_rate_limiter(account["user_id"])
+    pipeline_summary = None
+
+    # 파이프라인 모드면 결과를 기록 스레드 큐로 넘기고 바로 다음 검색 진행
+    def submit_result(search_text, product_results):
+        product_results, covered_keywords = journal_result(search_text, product_results)
+        if pipeline is not None:
+            pipeline.submit(search_text, product_results, covered_keywords)
+        else:
+            handle_result(search_text, product_results, covered_keywords)
+
+    def run_queries(query_list):
+        nonlocal driver, backend
+        queries.update({query.text: query for query in query_list})
+        search_dates = {query.text: query.dates for query in query_list}
+
+        if concurrency > 1:
+            # 여러 드라이버로 검색어를 나눠 검색
+            scrape_keywords_parallel(account, search_dates, submit_result, concurrency)
+            return
+
+        if backend is None:
+            # 떠 있는 브라우저 데몬이 있으면 연결 (크롬 실행 / 캐시 삭제 생략)
+            # 데몬이 떠 있지만 사용 중이면 같은 프로필로 크롬을 띄울 수 없으므로 BrowserDaemonBusyError로 중단
+            if USE_BROWSER_DAEMON:
+                driver = attach_to_daemon(account["user_id"])
+
+            if driver is None:
+                # 브라우저 실행 전 크롬 캐시 정리 (예산을 넘은 만큼만 삭제)
+                stats["cache"] = manage_chrome_cache(account["user_id"])
+
+                # 브라우저 실행 및 로그인
+                driver = create_driver(account["user_id"])
 
-    # print(f"대상 키워드: {list(keywords)}")
+            if not login_success_check(driver, account):
+                return
 
-    # 브라우저 실행 전 크롬 캐시 삭제
-    delete_chrome_cache(ACCOUNT["user_id"])
+            # 로그인 이후 검색은 설정된 백엔드(브라우저 / HTTP)로 수행
+            backend = create_fetch_backend(driver)
 
-    # 브라우저 실행 및 로그인
-    driver = create_driver(ACCOUNT["user_id"], headless=False)
+        # 결과 추출 (딕셔너리 형태: {datetime: [(kw, id, rank), ...]})
+        def on_result(search_text, product_results):
+            PROFILER.record_browser(search_text, sample_browser_metrics(driver))
+            submit_result(search_text, product_results)
+
+        # 각 검색어별 검색 및 데이터 추출 (속도 제한, 실패한 검색어는 백오프 후 재시도)
+        drain_search_queue(make_search_queue(search_dates), backend, limiter, on_result)
 
     try:
-        if login_success_check(driver, ACCOUNT):
-            # 각 키워드별 검색 및 데이터 추출
-            for keyword in keywords:
-                print(f"\n>>> 키워드 검색 시작: {keyword}")
-                search_keyword(driver, keyword)
-
-                # 웹 페이지에서 결과 추출 (딕셔너리 형태: {datetime: [(kw, id, rank), ...]})
-                product_results = extract_product_results(driver, target_dates)
-
-                # 추출된 결과를 엑셀 메모리에 업데이트
-                for target_date, items in product_results.items():
-                    date_str = target_date.strftime('%Y-%m-%d')  # 출력용 날짜 변환
-
-                    # product_results가 비었을 때
-                    if not items:
-                        print(f" [{date_str}] '{keyword}'에 대한 검색 결과가 없습니다.")
-                        continue
-
-                    # 각 날짜에 포함된 상품 리스트를 순회 (row_keyword, product_id, rank_number)
-                    for item in items:
-                        product_keyword = item[0]  # 튜플의 첫 번째: 행 키워드
-                        product_id = item[1]  # 튜플의 두 번째: ID
-                        product_rank = item[2]  # 튜플의 세 번째: 순위
-
-                        # 엑셀의 해당 날짜/키워드/ID 행을 찾아 순위 입력
-                        update_excel_rank(ws, product_id, product_keyword, product_rank, date_str)
-
-        # 최종 저장 (작업이 끝난 후 한 번에 저장)
+        if not keyword_dates:
+            print(">>> 모든 키워드가 이미 수집되어 있습니다. 저장소의 데이터를 엑셀에 기록합니다.")
+        else:
+            if concurrency > 1:
+                # 브라우저 실행 전 크롬 캐시 정리 (예산을 넘은 만큼만 삭제)
+                stats["cache"] = manage_chrome_cache(account["user_id"])
+
+            if PIPELINE_ENABLED:
+                # 검색하는 동안 기록 스레드가 저장소 기록 / 중간 저장을 처리 (저널은 큐에 넣기 전에 기록)
+                pipeline = ResultPipeline(handle_result)
+
+            # 검색 횟수가 가장 적은 쿼리 계획 (계정 ID 검색 1회 또는 키워드별 검색)
+            # 계정 검색은 채워진 행까지 모든 슬롯을 반환하므로 전체 슬롯 행 수로 비용 추정
+            planner_account_id = account["user_id"] if QUERY_PLANNER_ENABLED else None
+            run_queries(plan_queries(keyword_dates, planner_account_id, len(gap_matrix.rows)))
+
+            # 계정 검색에서 빠진 키워드는 키워드 검색으로 보충
+            if fallback_dates:
+                print(f"\n>>> 계정 검색에서 빠진 키워드 {len(fallback_dates)}개를 키워드로 다시 검색합니다.")
+                run_queries(plan_queries(dict(fallback_dates), None, 0))
+
+            if backend is not None:
+                backend.close()
+
+            if pipeline is not None:
+                pipeline.drain()
+                pipeline.close()
+                pipeline_summary = pipeline.print_summary(sum(PROFILER.keywords.values()), concurrency)
+
+        # 저장소의 순위를 엑셀 메모리로 내보낸 뒤 한 번에 저장
         print("\n데이터 기록 완료. 엑셀 파일을 저장합니다...")
-        wb.save(EXCEL_PATH)
+        written_cells = save_checkpoint()
+        stats["cells_written"] = len(written_cells)
         print("저장이 완료되었습니다.")
 
+        # 모두 저장되었으므로 저널은 더 이상 필요 없음
+        journal.discard()
+
     except Exception as e:
         print(f"실행 중 오류 발생: {e}")
+        stats["error"] = str(e)
+
+        # 기록 스레드가 큐에 남은 결과를 마저 기록하고 끝날 때까지 대기
+        if pipeline is not None:
+            pipeline.close()
+
+        # 지금까지 수집한 결과라도 저장 (실패해도 저널이 남아 있으므로 --resume으로 복구 가능)
+        if unsaved_results:
+            try:
+                print(f">>> 수집된 검색어 {unsaved_results}개 결과를 엑셀에 저장합니다...")
+                save_checkpoint()
+            except Exception as save_error:
+                print(f"중간 저장 실패: {save_error}. 다음 실행 시 --resume으로 복구하세요.")
     finally:
-        wb.close()
-        driver.quit()
+        journal.close()
+        store.close()
+        session.close()
+        if driver is not None:
+            release_driver(driver)
+
+    stats["done"] = len(done_keywords)
+    stats["failed"] = sorted(set(keyword_dates) - done_keywords)
+    stats["elapsed"] = time.perf_counter() - started
+
+    # 검색 / 로그인 대기 시간 요약
+    stats["waits"] = WAIT_STATS.summary()
+    WAIT_STATS.print_summary()
+
+    # 검색 속도 / 실패 / 재시도 요약
+    rate_metrics = limiter.print_summary()
+
+    # 키워드별 로드 시간 / 브라우저 메모리 요약 (렌더링 모드별 비교용)
+    browser_mode = {"headless": HEADLESS, "fast_render": FAST_RENDER, "page_load_strategy": PAGE_LOAD_STRATEGY}
+    load_summary = PROFILER.load_summary()
+    if load_summary["keywords"]:
+        print(f"\n===== 키워드 로드 요약 {browser_mode} =====")
+        print(f"첫 검색 {load_summary['first_load_sec']}초, 평균 {load_summary['avg_load_sec']}초 / 최대 {load_summary['max_load_sec']}초")
+        if load_summary["avg_js_heap_mb"] is not None:
+            print(f"JS 힙 평균 {load_summary['avg_js_heap_mb']}MB / 최대 {load_summary['max_js_heap_mb']}MB")
+
+    # 단계별 시간 / WebDriver 명령 수 / 셀 읽기·쓰기 수 리포트
+    PROFILER.write_report(f"run_{account['user_id']}", extra={"stats": stats, "browser_mode": browser_mode,
+                                                                     "pipeline": pipeline_summary,
+                                                                     "rate_limiter": rate_metrics})
+    return stats
+
+
+def resume_from_journal(journal, session, store, user_id):
+    """저널에 남은 결과를 저장소와 엑셀에 다시 기록하고 저장한 뒤 완료된 키워드 집합을 반환"""
+    # 저널 기록 직후 저장소 기록 전에 죽은 경우를 위해 저장소에도 다시 기록 (같은 값으로 덮어씀)
+    for search_text, keywords, product_results in journal.result_entries():
+        store.record_results(user_id, search_text, product_results, keywords)
+
+    done_keywords, product_results = journal.replay()
+    print(f">>> 이전 실행의 저널에서 검색어 결과를 복구합니다 (완료 키워드 {len(done_keywords)}개)")
+
+    with PROFILER.phase("journal_replay"):
+        written_cells = session.index.apply_ranks(product_results)
+        session.save(written_cells)
+    journal.checkpoint(len(written_cells))
+    return done_keywords
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="키워드별 광고 순위를 수집해 엑셀에 기록")
+    parser.add_argument("--resume", action="store_true",
+                        help="중간에 종료된 이전 실행의 저널을 엑셀에 반영하고 완료된 키워드는 건너뜀")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return run_account(ACCOUNT, resume=args.resume)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,71 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import ACCOUNTS, EXCEL_PATH, SCRAPE_CONCURRENCY
+from main import run_account, parse_args
+
+
+def _run_account_worker(account, resume=False):
+    """프로세스 풀에서 실행되는 계정별 작업 (계정마다 독립된 크롬 프로필 / 엑셀 파일 사용)"""
+    login_info = {"user_id": account["user_id"], "user_pw": account["user_pw"]}
+    return run_account(
+        login_info,
+        excel_path=account.get("excel_path", EXCEL_PATH),
+        sheet_name=account.get("sheet_name", "데이터"),
+        concurrency=account.get("concurrency", SCRAPE_CONCURRENCY),
+        resume=resume,
+    )
+
+
+def validate_accounts(accounts):
+    """두 프로세스가 같은 엑셀 파일을 동시에 저장하지 않도록 계정별 파일이 겹치는지 확인"""
+    seen = {}
+    for account in accounts:
+        excel_path = os.path.abspath(account.get("excel_path", EXCEL_PATH))
+        if excel_path in seen:
+            raise ValueError(f"계정 {seen[excel_path]}와 {account['user_id']}가 같은 엑셀 파일을 사용합니다: {excel_path}")
+        seen[excel_path] = account["user_id"]
+
+
+def print_account_report(results):
+    print("\n===== 계정별 실행 결과 =====")
+    for stats in results:
+        minutes = stats["elapsed"] / 60 if stats["elapsed"] else 0
+        throughput = stats["done"] / minutes if minutes else 0
+        print(f"[{stats['user_id']}] 키워드 {stats['done']}/{stats['keywords']}개 완료, "
+              f"셀 {stats['cells_written']}개 기록, {stats['elapsed']:.1f}초 ({throughput:.1f} 키워드/분)")
+        if stats["resumed"]:
+            print(f"  저널에서 복구한 키워드 {stats['resumed']}개")
+        if stats["failed"]:
+            print(f"  실패 키워드 {len(stats['failed'])}개: {stats['failed']}")
+        if stats["error"]:
+            print(f"  오류: {stats['error']}")
+
+
+def run_all_accounts(accounts=ACCOUNTS, resume=False):
+    """계정마다 프로세스 하나씩 동시에 실행하고 계정별 통계 목록을 반환"""
+    validate_accounts(accounts)
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=len(accounts)) as executor:
+        futures = {executor.submit(_run_account_worker, account, resume): account for account in accounts}
+
+        for future in as_completed(futures):
+            account = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # 프로세스 자체가 실패한 경우
+                results.append({"user_id": account["user_id"], "excel_path": account.get("excel_path", EXCEL_PATH),
+                                "keywords": 0, "done": 0, "resumed": 0, "failed": [], "cells_written": 0,
+                                "elapsed": time.perf_counter() - started, "error": str(e)})
+
+    print_account_report(results)
+    print(f"\n전체 소요 시간: {time.perf_counter() - started:.1f}초")
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_all_accounts(resume=args.resume)
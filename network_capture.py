@@ -0,0 +1,66 @@
+import base64
+import json
+import os
+import re
+from datetime import datetime
+from selenium.common.exceptions import WebDriverException
+from config import CAPTURE_URL_PATTERN, CAPTURE_MIME_TYPES
+
+
+def enable_performance_logging(options):
+    """크롬 performance 로그(DevTools Network 이벤트)를 driver.get_log("performance")로 받도록 설정"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def clear_performance_log(driver):
+    """지금까지 쌓인 이벤트를 버림 (다음 검색의 응답만 보기 위해)"""
+    driver.get_log("performance")
+
+
+def capture_responses(driver, url_pattern=CAPTURE_URL_PATTERN, mime_types=CAPTURE_MIME_TYPES):
+    """
+    performance 로그에서 url_pattern에 맞고 로딩이 끝난 응답의 본문을
+    [(url, mime_type, body), ...] (도착 순서)로 반환
+    """
+    matched = {}    # {requestId: (url, mime_type)}
+    finished = []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        method = message.get("method")
+        params = message.get("params", {})
+
+        if method == "Network.responseReceived":
+            response = params["response"]
+            mime_type = response.get("mimeType", "")
+            if re.search(url_pattern, response["url"]) and any(t in mime_type for t in mime_types):
+                matched[params["requestId"]] = (response["url"], mime_type)
+        elif method == "Network.loadingFinished" and params.get("requestId") in matched:
+            finished.append(params["requestId"])
+
+    responses = []
+    for request_id in finished:
+        url, mime_type = matched[request_id]
+        try:
+            result = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except WebDriverException as e:
+            # 페이지 이동 등으로 본문이 이미 버려진 경우
+            print(f"응답 본문을 가져오지 못했습니다 ({url}): {e.msg}")
+            continue
+
+        body = result["body"]
+        if result.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", errors="replace")
+        responses.append((url, mime_type, body))
+    return responses
+
+
+def save_payload(save_dir, keyword, url, mime_type, body):
+    """캡처한 응답을 fixture 파일로 저장하고 경로를 반환 (파서 확인 / 재현용)"""
+    os.makedirs(save_dir, exist_ok=True)
+    ext = "json" if "json" in mime_type else "html"
+    safe_keyword = re.sub(r'[\\/:*?"<>|\s]+', "_", keyword)
+    path = os.path.join(save_dir, f"{safe_keyword}_{datetime.now():%Y%m%d_%H%M%S_%f}.{ext}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(body)
+    print(f"응답 저장: {path} ({url})")
+    return path
@@ -0,0 +1,106 @@
+import queue
+import threading
+import time
+from config import PIPELINE_QUEUE_SIZE
+
+_STOP = object()
+
+
+class ResultPipeline:
+    """
+    검색(생산자)과 기록(소비자)을 겹쳐서 실행하는 파이프라인
+    - 검색 쪽은 submit()으로 결과를 크기 제한 큐에 넣고, 큐가 가득 차면 기록이 따라올 때까지 대기 (back-pressure)
+    - 기록 스레드 하나가 큐에서 꺼내 submit()에 넘긴 인자 그대로 handle_result(...)를 호출
+      (저장소 / 엑셀 기록은 항상 이 스레드 하나에서만 이루어짐)
+    """
+
+    def __init__(self, handle_result, maxsize=PIPELINE_QUEUE_SIZE):
+        self.handle_result = handle_result
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.maxsize = maxsize
+        self.error = None
+        self.stats = {"submitted": 0, "written": 0, "max_depth": 0,
+                      "put_blocked_sec": 0.0, "write_busy_sec": 0.0, "write_idle_sec": 0.0}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._elapsed = None
+        self._writer = threading.Thread(target=self._write_loop, name="result-writer", daemon=True)
+        self._writer.start()
+
+    def _add(self, name, amount):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _write_loop(self):
+        while True:
+            waited = time.perf_counter()
+            item = self.queue.get()
+            started = time.perf_counter()
+            self._add("write_idle_sec", started - waited)
+            try:
+                if item is _STOP:
+                    return
+                # 기록 중 오류가 나면 이후 결과는 버리되 큐는 계속 비워서 검색 쪽이 막히지 않게 함
+                if self.error is None:
+                    self.handle_result(*item)
+                    self._add("written", 1)
+            except Exception as e:
+                print(f"[기록 스레드] 결과 기록 중 오류 발생: {e}")
+                self.error = e
+            finally:
+                self._add("write_busy_sec", time.perf_counter() - started)
+                self.queue.task_done()
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def submit(self, *result):
+        """결과를 기록 큐에 넣음 (큐가 가득 차 있으면 빈자리가 날 때까지 대기)"""
+        self._raise_error()
+        started = time.perf_counter()
+        self.queue.put(result)
+        with self._lock:
+            self.stats["put_blocked_sec"] += time.perf_counter() - started
+            self.stats["submitted"] += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], self.queue.qsize())
+
+    def drain(self):
+        """지금까지 넣은 결과가 모두 기록될 때까지 대기 (기록 중 오류가 있었으면 다시 발생)"""
+        self.queue.join()
+        self._raise_error()
+
+    def close(self):
+        """남은 결과를 모두 기록한 뒤 기록 스레드를 종료 (여러 번 호출해도 됨)"""
+        if self._elapsed is not None:
+            return
+        self.queue.put(_STOP)
+        self._writer.join()
+        self._elapsed = time.perf_counter() - self._started
+
+    def summary(self, scrape_busy_sec, scrapers=1):
+        """
+        단계별 사용률과 겹쳐서 실행된 시간
+        overlap_sec: 검색 + 기록 시간 합 - 전체 시간 (순차 실행 대비 절약된 시간, 검색 스레드 1개 기준)
+        """
+        wall = self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            **{name: round(value, 3) if isinstance(value, float) else value for name, value in stats.items()},
+            "queue_size": self.maxsize,
+            "wall_sec": round(wall, 3),
+            "scrape_busy_sec": round(scrape_busy_sec, 3),
+            "scrape_util": round(scrape_busy_sec / (wall * scrapers), 3) if wall else None,
+            "write_util": round(stats["write_busy_sec"] / wall, 3) if wall else None,
+            "overlap_sec": round(max(0.0, scrape_busy_sec + stats["write_busy_sec"] - wall), 3),
+        }
+
+    def print_summary(self, scrape_busy_sec, scrapers=1):
+        summary = self.summary(scrape_busy_sec, scrapers)
+        print("\n===== 검색 / 기록 파이프라인 =====")
+        print(f"전체 {summary['wall_sec']}초 | 검색 {summary['scrape_busy_sec']}초 (사용률 {summary['scrape_util']}) | "
+              f"기록 {summary['write_busy_sec']}초 (사용률 {summary['write_util']})")
+        print(f"겹친 시간 {summary['overlap_sec']}초 | 큐 대기(back-pressure) {summary['put_blocked_sec']}초 | "
+              f"최대 큐 길이 {summary['max_depth']}/{summary['queue_size']}")
+        return summary
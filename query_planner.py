@@ -0,0 +1,50 @@
+import math
+from collections import namedtuple
+from config import RESULT_PAGE_SIZE
+
+
+# text: 검색창에 입력할 값 (키워드 또는 계정 ID)
+# dates: 매칭할 날짜 목록 (오름차순)
+# keywords: 이 검색으로 채우려는 엑셀 키워드들
+# kind: "keyword" / "account"
+SearchQuery = namedtuple("SearchQuery", ["text", "dates", "keywords", "kind"])
+
+
+def plan_queries(keyword_dates, account_id, slot_count, page_size=RESULT_PAGE_SIZE):
+    """
+    {keyword: [date, ...]} 계획을 가장 적은 검색 횟수로 처리할 쿼리 목록으로 변환
+    - 키워드별 검색: 키워드 수만큼 검색
+    - 계정 ID 검색: 계정의 모든 슬롯이 나오므로 페이지 수만큼 (slot_count / page_size)
+    결과 행의 키워드(td[6])로 엑셀 행에 배분되므로 계정 검색 한 번으로 여러 키워드를 채울 수 있음
+    """
+    if not keyword_dates:
+        return []
+
+    keyword_cost = len(keyword_dates)
+    account_cost = max(1, math.ceil(slot_count / page_size))
+
+    if account_id and account_cost < keyword_cost:
+        all_dates = sorted({d for dates in keyword_dates.values() for d in dates})
+        print(f"쿼리 계획: 계정 ID 검색 1회 (예상 {account_cost}페이지) < 키워드 검색 {keyword_cost}회")
+        return [SearchQuery(account_id, all_dates, tuple(sorted(keyword_dates)), "account")]
+
+    print(f"쿼리 계획: 키워드 검색 {keyword_cost}회")
+    return [SearchQuery(keyword, dates, (keyword,), "keyword") for keyword, dates in keyword_dates.items()]
+
+
+def check_coverage(query, product_results, needed_pairs):
+    """
+    검색 결과가 엑셀에서 필요한 (키워드, VI ID) 행을 얼마나 채웠는지 확인
+    결과에 한 행도 나오지 않은 키워드 목록(키워드 검색으로 다시 시도할 대상)을 반환
+    needed_pairs: {(keyword, vi_id), ...}
+    """
+    returned_pairs = {(item[0], str(item[1])) for items in product_results.values() for item in items}
+    returned_keywords = {keyword for keyword, _ in returned_pairs}
+
+    query_pairs = {pair for pair in needed_pairs if pair[0] in query.keywords}
+    covered = len(query_pairs & returned_pairs)
+    uncovered_keywords = [keyword for keyword in query.keywords if keyword not in returned_keywords]
+
+    print(f"'{query.text}' 검색 커버리지: 필요한 행 {covered}/{len(query_pairs)}개, "
+          f"결과 없는 키워드 {len(uncovered_keywords)}개")
+    return uncovered_keywords
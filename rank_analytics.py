@@ -0,0 +1,160 @@
+import argparse
+import os
+import time
+import numpy as np
+from config import EXCEL_PATH, RANK_EXPORT_PATH
+from rank_export import read_rank_matrix, load_rank_matrix
+
+
+def day_over_day_deltas(matrix):
+    """
+    (슬롯 × 날짜-1) 전일 대비 순위 변화 (오늘 순위 - 어제 순위)
+    음수면 순위가 올라감, 어느 한쪽이라도 순위가 없으면 NaN
+    """
+    return matrix.ranks[:, 1:] - matrix.ranks[:, :-1]
+
+
+def top_movers(matrix, n=10, date=None):
+    """
+    date(기본값: 마지막 날짜)의 전일 대비 가장 많이 오른 / 떨어진 슬롯
+    {"date", "risers": [...], "fallers": [...]}, 각 항목은 (키워드, VI ID, 어제, 오늘, 변화)
+    """
+    if len(matrix.dates) < 2:
+        return {"date": None, "risers": [], "fallers": []}
+
+    col = len(matrix.dates) - 1 if date is None else int(np.flatnonzero(matrix.dates == date)[0])
+    if col == 0:
+        return {"date": matrix.dates[0], "risers": [], "fallers": []}
+
+    delta = matrix.ranks[:, col] - matrix.ranks[:, col - 1]
+    moved = np.flatnonzero(~np.isnan(delta) & (delta != 0))
+    order = moved[np.argsort(delta[moved], kind="stable")]
+
+    def describe(idx):
+        return [(matrix.keywords[i], matrix.vi_ids[i], int(matrix.ranks[i, col - 1]), int(matrix.ranks[i, col]),
+                 int(delta[i])) for i in idx]
+
+    risers = order[delta[order] < 0][:n]
+    fallers = order[delta[order] > 0][::-1][:n]
+    return {"date": matrix.dates[col], "risers": describe(risers), "fallers": describe(fallers)}
+
+
+def out_of_rank_streaks(matrix):
+    """
+    슬롯별 순위밖 연속 일수 (longest: 가장 긴 기간, current: 마지막 날짜까지 이어지는 기간)
+    슬롯의 첫 순위 이전(광고 시작 전) 날짜는 제외하고, 빈 칸도 순위밖으로 봄
+    (openpyxl로 전체 저장하면 순위밖('')이 빈 칸으로 저장되기 때문)
+    """
+    ranked = matrix.ranked
+    active = np.maximum.accumulate(ranked, axis=1)
+    unranked = active & ~ranked
+
+    # 순위가 있는 날마다 카운터를 0으로 되돌리는 누적 길이
+    positions = np.arange(1, unranked.shape[1] + 1)
+    last_reset = np.maximum.accumulate(np.where(unranked, 0, positions), axis=1)
+    runs = np.where(unranked, positions - last_reset, 0)
+
+    if runs.shape[1] == 0:
+        empty = np.zeros(len(matrix.rows), dtype=int)
+        return {"longest": empty, "current": empty}
+    return {"longest": runs.max(axis=1), "current": runs[:, -1]}
+
+
+def keyword_averages(matrix):
+    """
+    키워드별 평균 순위 / 순위가 있는 칸 수(슬롯 × 날짜) / 순위 노출 비율
+    {키워드: {"avg_rank", "ranked_days", "ranked_ratio"}}
+    """
+    keywords, inverse = np.unique(matrix.keywords, return_inverse=True)
+    ranked = matrix.ranked
+    active = np.maximum.accumulate(ranked, axis=1)
+
+    ranked_days = np.bincount(inverse, weights=ranked.sum(axis=1), minlength=len(keywords))
+    active_days = np.bincount(inverse, weights=active.sum(axis=1), minlength=len(keywords))
+    rank_sums = np.bincount(inverse, weights=np.where(ranked, matrix.ranks, 0).sum(axis=1), minlength=len(keywords))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_ranks = rank_sums / ranked_days
+        ratios = ranked_days / active_days
+
+    return {
+        str(keyword): {
+            "avg_rank": None if np.isnan(avg) else round(float(avg), 2),
+            "ranked_days": int(days),
+            "ranked_ratio": None if np.isnan(ratio) else round(float(ratio), 3),
+        }
+        for keyword, avg, days, ratio in zip(keywords, avg_ranks, ranked_days, ratios)
+    }
+
+
+def analyze(matrix, top_n=10):
+    """전체 분석 결과를 한 번에 계산"""
+    streaks = out_of_rank_streaks(matrix)
+    deltas = day_over_day_deltas(matrix)
+    changed = ~np.isnan(deltas)
+    return {
+        "slots": len(matrix.rows),
+        "dates": len(matrix.dates),
+        "avg_daily_change": round(float(np.abs(deltas[changed]).mean()), 2) if changed.any() else None,
+        "movers": top_movers(matrix, top_n),
+        "streaks": streaks,
+        "keywords": keyword_averages(matrix),
+    }
+
+
+def print_report(matrix, result, top_n=10):
+    print(f"\n===== 순위 분석: {matrix} =====")
+    if len(matrix.dates):
+        print(f"기간 {matrix.dates[0]} ~ {matrix.dates[-1]}, 평균 일일 변동 {result['avg_daily_change']}위")
+
+    movers = result["movers"]
+    print(f"\n[{movers['date']}] 가장 많이 오른 슬롯")
+    for keyword, vi_id, before, after, delta in movers["risers"]:
+        print(f"  {keyword} | {vi_id} | {before}위 → {after}위 ({delta:+d})")
+    print(f"[{movers['date']}] 가장 많이 떨어진 슬롯")
+    for keyword, vi_id, before, after, delta in movers["fallers"]:
+        print(f"  {keyword} | {vi_id} | {before}위 → {after}위 ({delta:+d})")
+
+    current = result["streaks"]["current"]
+    print("\n현재 순위밖이 가장 오래 이어지는 슬롯")
+    for i in np.argsort(-current, kind="stable")[:top_n]:
+        if current[i] == 0:
+            break
+        print(f"  {matrix.keywords[i]} | {matrix.vi_ids[i]} | {current[i]}일 (최장 {result['streaks']['longest'][i]}일)")
+
+    print("\n키워드별 평균 순위 (상위)")
+    ranked_keywords = sorted((item for item in result["keywords"].items() if item[1]["avg_rank"] is not None),
+                             key=lambda item: item[1]["avg_rank"])
+    for keyword, info in ranked_keywords[:top_n]:
+        print(f"  {keyword} | 평균 {info['avg_rank']}위 | 순위 {info['ranked_days']}회 | 노출 {info['ranked_ratio']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="순위 행렬 분석 (전일 대비 변화 / 급등락 / 순위밖 기간 / 키워드 평균)")
+    parser.add_argument("--input", default=None,
+                        help=f"rank_export로 저장한 파일 (기본값: {os.path.basename(RANK_EXPORT_PATH)}이 있으면 사용, 없으면 엑셀)")
+    parser.add_argument("--excel", default=EXCEL_PATH)
+    parser.add_argument("--sheet", default="데이터")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    input_path = args.input
+    if input_path is None:
+        npz_path = os.path.splitext(RANK_EXPORT_PATH)[0] + ".npz"
+        input_path = next((p for p in (RANK_EXPORT_PATH, npz_path) if os.path.exists(p)), None)
+
+    started = time.perf_counter()
+    matrix = load_rank_matrix(input_path) if input_path else read_rank_matrix(args.excel, args.sheet)
+    load_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = analyze(matrix, args.top)
+    analyze_sec = time.perf_counter() - started
+
+    print_report(matrix, result, args.top)
+    print(f"\n불러오기 {load_sec:.2f}초 ({input_path or args.excel}), 분석 {analyze_sec * 1000:.1f}ms")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import os
+import time
+import numpy as np
+from openpyxl import load_workbook
+from config import EXCEL_PATH, RANK_EXPORT_PATH
+from excel_handler import (
+    DATA_START_ROW,
+    COL_VI_ID,
+    COL_KEYWORD,
+    normalize_vi_id,
+    find_date_columns,
+    read_cell_block,
+)
+
+# pyarrow가 있으면 Parquet / Arrow(Feather)로, 없으면 NumPy .npz로 저장
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# status 값
+STATUS_EMPTY = 0     # 값 없음
+STATUS_RANKED = 1    # 순위 숫자
+STATUS_UNRANKED = 2  # 값은 있지만 숫자가 아님 ('' / '순위밖' 등)
+
+
+def _parse_rank(value):
+    """셀 값 → (순위, status), 순위가 없으면 NaN"""
+    if value is None:
+        return np.nan, STATUS_EMPTY
+    if isinstance(value, (int, float)):
+        return float(value), STATUS_RANKED
+    text = str(value).strip().replace("위", "")
+    if text.isdigit():
+        return float(text), STATUS_RANKED
+    return np.nan, STATUS_UNRANKED
+
+
+_parse_ranks = np.frompyfunc(_parse_rank, 1, 2)
+
+
+class RankMatrix:
+    """
+    슬롯 행 × 날짜 순위 행렬
+    - rows / vi_ids / keywords: 슬롯(행)별 정보
+    - dates: 'YYYY-MM-DD' 날짜 (열 순서)
+    - ranks: float32 (순위가 없으면 NaN), status: int8 (STATUS_*)
+    """
+
+    def __init__(self, rows, vi_ids, keywords, dates, ranks, status):
+        self.rows = np.asarray(rows, dtype=np.int32)
+        self.vi_ids = np.asarray(vi_ids, dtype=str)
+        self.keywords = np.asarray(keywords, dtype=str)
+        self.dates = np.asarray(dates, dtype=str)
+        self.ranks = np.asarray(ranks, dtype=np.float32)
+        self.status = np.asarray(status, dtype=np.int8)
+
+    @property
+    def ranked(self):
+        return self.status == STATUS_RANKED
+
+    def __repr__(self):
+        return f"RankMatrix(슬롯 {len(self.rows)}개 × 날짜 {len(self.dates)}개)"
+
+    @classmethod
+    def from_sheet(cls, ws, until=None):
+        """시트를 한 번에 읽어 행렬 생성 (ID나 키워드가 없는 행은 제외)"""
+        date_cols, date_texts = find_date_columns(ws, until)
+        if not date_cols or ws.max_row < DATA_START_ROW:
+            empty = np.zeros((0, len(date_cols)))
+            return cls([], [], [], date_texts, empty, empty)
+
+        values = read_cell_block(ws, DATA_START_ROW, ws.max_row, COL_VI_ID, max(date_cols))
+        row_numbers = np.arange(DATA_START_ROW, DATA_START_ROW + len(values))
+
+        vi_ids = np.frompyfunc(normalize_vi_id, 1, 1)(values[:, 0])
+        keywords = np.frompyfunc(lambda v: str(v or "").strip(), 1, 1)(values[:, COL_KEYWORD - COL_VI_ID])
+        valid = (vi_ids != "") & (keywords != "")
+
+        ranks, status = _parse_ranks(values[valid][:, np.array(date_cols) - COL_VI_ID])
+        return cls(row_numbers[valid], vi_ids[valid].astype(str), keywords[valid].astype(str), date_texts,
+                   ranks.astype(np.float32), status.astype(np.int8))
+
+    # 긴 형식(값이 있는 셀만): row, vi_id, keyword, date, rank, status
+    def to_columns(self):
+        slot_idx, date_idx = np.nonzero(self.status != STATUS_EMPTY)
+        return {
+            "row": self.rows[slot_idx],
+            "vi_id": self.vi_ids[slot_idx],
+            "keyword": self.keywords[slot_idx],
+            "date": self.dates[date_idx],
+            "rank": self.ranks[slot_idx, date_idx],
+            "status": self.status[slot_idx, date_idx],
+        }
+
+    @classmethod
+    def from_columns(cls, columns):
+        """to_columns() 형태의 열들을 다시 행렬로 변환"""
+        row_numbers, slot_idx = np.unique(np.asarray(columns["row"], dtype=np.int32), return_inverse=True)
+
+        # 값이 하나도 없는 날짜도 열로 유지 (전일 대비 계산이 하루 간격이 되도록)
+        day_values = np.asarray(columns["date"], dtype="datetime64[D]")
+        if len(day_values):
+            days = np.arange(day_values.min(), day_values.max() + 1)
+        else:
+            days = np.zeros(0, dtype="datetime64[D]")
+        date_idx = (day_values - days[0]).astype(int) if len(days) else np.zeros(0, dtype=int)
+        dates = days.astype(str)
+
+        # 행 번호별 ID / 키워드 (같은 행은 값이 같으므로 아무거나 하나)
+        vi_ids = np.empty(len(row_numbers), dtype=object)
+        keywords = np.empty(len(row_numbers), dtype=object)
+        vi_ids[slot_idx] = np.asarray(columns["vi_id"], dtype=object)
+        keywords[slot_idx] = np.asarray(columns["keyword"], dtype=object)
+
+        ranks = np.full((len(row_numbers), len(dates)), np.nan, dtype=np.float32)
+        status = np.zeros((len(row_numbers), len(dates)), dtype=np.int8)
+        ranks[slot_idx, date_idx] = np.asarray(columns["rank"], dtype=np.float32)
+        status[slot_idx, date_idx] = np.asarray(columns["status"], dtype=np.int8)
+        return cls(row_numbers, vi_ids.astype(str), keywords.astype(str), dates, ranks, status)
+
+
+def read_rank_matrix(excel_path=EXCEL_PATH, sheet_name='데이터', until=None):
+    """엑셀을 읽기 전용(data_only)으로 한 번 열어 RankMatrix 생성"""
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        return RankMatrix.from_sheet(wb[sheet_name], until)
+    finally:
+        wb.close()
+
+
+def save_rank_matrix(matrix, path=RANK_EXPORT_PATH):
+    """
+    확장자에 따라 저장: .parquet / .arrow(.feather)는 pyarrow 필요, .npz는 NumPy만 사용
+    pyarrow가 없으면 .npz로 바꿔 저장, 실제 저장한 경로를 반환
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext != ".npz" and pa is None:
+        path = os.path.splitext(path)[0] + ".npz"
+        print(f"pyarrow가 설치되어 있지 않아 NumPy 형식으로 저장합니다: {path}")
+        ext = ".npz"
+
+    if ext == ".npz":
+        np.savez_compressed(path, rows=matrix.rows, vi_ids=matrix.vi_ids, keywords=matrix.keywords,
+                            dates=matrix.dates, ranks=matrix.ranks, status=matrix.status)
+        return path
+
+    columns = matrix.to_columns()
+    table = pa.table({
+        "row": pa.array(columns["row"], type=pa.int32()),
+        "vi_id": pa.array(columns["vi_id"]).dictionary_encode(),
+        "keyword": pa.array(columns["keyword"]).dictionary_encode(),
+        "date": pa.array(columns["date"].astype("datetime64[D]"), type=pa.date32()),
+        # 순위가 없는 칸은 null
+        "rank": pa.array(columns["rank"], type=pa.float32(), from_pandas=True).cast(pa.int16()),
+        "status": pa.array(columns["status"], type=pa.int8()),
+    })
+    if ext == ".parquet":
+        pq.write_table(table, path, compression="zstd")
+    else:
+        feather.write_feather(table, path, compression="zstd")
+    return path
+
+
+def load_rank_matrix(path=RANK_EXPORT_PATH):
+    """save_rank_matrix로 저장한 파일을 RankMatrix로 읽기"""
+    if path.lower().endswith(".npz"):
+        with np.load(path) as data:
+            return RankMatrix(data["rows"], data["vi_ids"], data["keywords"], data["dates"],
+                              data["ranks"], data["status"])
+
+    if pa is None:
+        raise RuntimeError(f"{path}를 읽으려면 pyarrow가 필요합니다.")
+    table = pq.read_table(path) if path.lower().endswith(".parquet") else feather.read_table(path)
+    columns = {
+        "row": table.column("row").to_numpy(),
+        "vi_id": np.asarray(table.column("vi_id").cast(pa.string()).to_pylist(), dtype=object),
+        "keyword": np.asarray(table.column("keyword").cast(pa.string()).to_pylist(), dtype=object),
+        "date": table.column("date").to_numpy().astype("datetime64[D]").astype(str),
+        "rank": table.column("rank").cast(pa.float32()).fill_null(float("nan")).to_numpy(),
+        "status": table.column("status").to_numpy(),
+    }
+    return RankMatrix.from_columns(columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="'데이터' 시트의 순위 행렬을 Parquet / Arrow / npz로 내보내기")
+    parser.add_argument("--excel", default=EXCEL_PATH)
+    parser.add_argument("--sheet", default="데이터")
+    parser.add_argument("--out", default=RANK_EXPORT_PATH, help="저장 경로 (.parquet / .arrow / .npz)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    matrix = read_rank_matrix(args.excel, args.sheet)
+    read_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    path = save_rank_matrix(matrix, args.out)
+    print(f"{matrix} 읽기 {read_sec:.2f}초, 저장 {time.perf_counter() - started:.2f}초 "
+          f"→ {path} ({os.path.getsize(path) / 1024:.1f}KB)")
+    return path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import sqlite3
+from datetime import datetime
+from config import RANK_STORE_PATH
+
+
+class RankStore:
+    """
+    (계정, 키워드, VI ID, 날짜)별 순위를 저장하는 SQLite 저장소
+    - ranks: 추출된 순위 (키워드는 결과 행의 키워드)
+    - searches: 어떤 검색 키워드로 어떤 날짜를 이미 수집했는지 (결과가 없던 경우 포함)
+    """
+
+    def __init__(self, path=RANK_STORE_PATH, busy_timeout=30):
+        self.path = path
+        # 파이프라인 모드에서는 기록 스레드가 사용 (한 번에 한 스레드만 접근)
+        # 여러 계정 프로세스(multi_account_runner)가 같은 파일에 쓰므로, 다른 프로세스가 쓰는 중이면 busy_timeout초까지 대기
+        self.conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS ranks (
+                account TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                vi_id TEXT NOT NULL,
+                date TEXT NOT NULL,
+                rank TEXT NOT NULL,
+                scraped_at TEXT NOT NULL,
+                PRIMARY KEY (account, keyword, vi_id, date)
+            );
+            CREATE TABLE IF NOT EXISTS searches (
+                account TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                date TEXT NOT NULL,
+                searched_at TEXT NOT NULL,
+                PRIMARY KEY (account, keyword, date)
+            );
+        """)
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def record_results(self, account, search_keyword, product_results, covered_keywords=None):
+        """
+        extract_product_results 결과({datetime: [(kw, id, rank), ...]})를 바로 저장
+        결과가 비어 있는 날짜도 '수집 완료'로 기록
+        covered_keywords: 계정 ID 검색처럼 한 번의 검색으로 수집 완료된 엑셀 키워드 목록
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        searched_keywords = [search_keyword] if covered_keywords is None else covered_keywords
+        rank_rows = []
+        search_rows = []
+        for target_date, items in product_results.items():
+            date_str = target_date.strftime('%Y-%m-%d')
+            for keyword in searched_keywords:
+                search_rows.append((account, keyword, date_str, now))
+            for row_keyword, product_id, rank_number in items:
+                rank_rows.append((account, row_keyword, str(product_id), date_str, rank_number, now))
+
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO ranks VALUES (?, ?, ?, ?, ?, ?)", rank_rows)
+            self.conn.executemany("INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?)", search_rows)
+        return len(rank_rows)
+
+    def filter_pending(self, account, keyword_dates):
+        """{keyword: [date, ...]} 계획에서 이미 수집한 (키워드, 날짜)를 제외"""
+        done = set(self.conn.execute(
+            "SELECT keyword, date FROM searches WHERE account = ?", (account,)))
+
+        pending = {}
+        for keyword, dates in keyword_dates.items():
+            missing_dates = [d for d in dates if (keyword, d) not in done]
+            if missing_dates:
+                pending[keyword] = missing_dates
+        return pending
+
+    def get_results(self, account, dates):
+        """저장된 순위를 extract_product_results와 같은 {datetime: [(kw, id, rank), ...]} 형태로 반환"""
+        product_results = {datetime.strptime(d, '%Y-%m-%d'): [] for d in dates}
+        if not dates:
+            return product_results
+
+        placeholders = ",".join("?" * len(dates))
+        rows = self.conn.execute(
+            f"SELECT date, keyword, vi_id, rank FROM ranks WHERE account = ? AND date IN ({placeholders})",
+            (account, *dates))
+        for date_str, keyword, vi_id, rank in rows:
+            product_results[datetime.strptime(date_str, '%Y-%m-%d')].append((keyword, vi_id, rank))
+        return product_results
+
+    def export_to_sheet(self, sheet_index, account, dates, only_cells=None):
+        """
+        저장소의 순위를 엑셀 시트의 빈칸(only_cells)에 기록하고 기록된 셀 목록 [(row, col, rank), ...]을 반환
+        """
+        return sheet_index.apply_ranks(self.get_results(account, dates), only_cells)
+
+    def history(self, account, keyword=None, vi_id=None):
+        """엑셀을 열지 않고 순위 이력 조회: [(keyword, vi_id, date, rank), ...]"""
+        query = "SELECT keyword, vi_id, date, rank FROM ranks WHERE account = ?"
+        params = [account]
+        if keyword is not None:
+            query += " AND keyword = ?"
+            params.append(keyword)
+        if vi_id is not None:
+            query += " AND vi_id = ?"
+            params.append(str(vi_id))
+        query += " ORDER BY keyword, vi_id, date"
+        return self.conn.execute(query, params).fetchall()
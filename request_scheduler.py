@@ -0,0 +1,224 @@
+import queue
+import random
+import threading
+import time
+from collections import namedtuple
+from config import (
+    SEARCH_RATE_INITIAL,
+    SEARCH_RATE_MIN,
+    SEARCH_RATE_MAX,
+    SEARCH_RATE_BURST,
+    SEARCH_RATE_INCREASE,
+    SEARCH_RATE_DECREASE,
+    SEARCH_SLOWDOWN_FACTOR,
+    SEARCH_BACKOFF_BASE_SEC,
+    SEARCH_BACKOFF_MAX_SEC,
+    SEARCH_MAX_ATTEMPTS,
+)
+from instrumentation import PROFILER
+
+
+class SearchFailedError(Exception):
+    """검색 실패 (blocked=True: 사이트가 요청을 거부 / 제한한 경우)"""
+
+    def __init__(self, keyword, reason, blocked=False):
+        super().__init__(f"'{keyword}' 검색 실패: {reason}")
+        self.keyword = keyword
+        self.blocked = blocked
+
+
+def backoff_delay(attempt, base=SEARCH_BACKOFF_BASE_SEC, cap=SEARCH_BACKOFF_MAX_SEC):
+    """attempt번째 재시도 전 대기 시간: 지수 증가 + 지터 (최소 절반은 대기해서 너무 빠른 재시도 방지)"""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
+class AdaptiveRateLimiter:
+    """
+    계정별 검색 속도 제한 (토큰 버킷)
+    - 성공하면 속도를 조금씩 올리고(가산 증가), 실패 / 차단되거나 응답이 평소보다 크게 느려지면 절반으로 줄임(승산 감소)
+    - 사이트가 느려지기 직전의 속도 근처에서 유지됨
+    """
+
+    def __init__(self, account_id, rate=SEARCH_RATE_INITIAL, min_rate=SEARCH_RATE_MIN,
+                 max_rate=SEARCH_RATE_MAX, burst=SEARCH_RATE_BURST):
+        self.account_id = account_id
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.baseline_latency = None   # 정상 응답 시간 (지수 이동 평균)
+        self.stats = {"requests": 0, "successes": 0, "failures": 0, "blocked": 0, "slowdowns": 0,
+                      "increases": 0, "decreases": 0, "retries": 0, "given_up": 0,
+                      "throttle_wait_sec": 0.0, "latency_sec": 0.0}
+        self.min_rate_seen = rate
+        self.max_rate_seen = rate
+        self.rate_history = []          # [(경과 초, 속도), ...] 속도가 줄어든 시점
+        self._started = time.monotonic()
+
+    def acquire(self):
+        """토큰이 생길 때까지 대기한 뒤 하나 사용"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.stats["requests"] += 1
+                    self.stats["throttle_wait_sec"] += waited
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def _set_rate(self, rate):
+        self.rate = max(self.min_rate, min(self.max_rate, rate))
+        self.min_rate_seen = min(self.min_rate_seen, self.rate)
+        self.max_rate_seen = max(self.max_rate_seen, self.rate)
+
+    def _decrease(self):
+        self._set_rate(self.rate * SEARCH_RATE_DECREASE)
+        self.stats["decreases"] += 1
+        self.rate_history.append((round(time.monotonic() - self._started, 1), round(self.rate, 3)))
+
+    def record_success(self, latency):
+        with self._lock:
+            self.stats["successes"] += 1
+            self.stats["latency_sec"] += latency
+
+            if self.baseline_latency is not None and latency > self.baseline_latency * SEARCH_SLOWDOWN_FACTOR:
+                # 평소보다 크게 느려짐 → 사이트 부하 신호로 보고 속도를 낮춤
+                self.stats["slowdowns"] += 1
+                self._decrease()
+            else:
+                self._set_rate(self.rate + SEARCH_RATE_INCREASE)
+                self.stats["increases"] += 1
+
+            if self.baseline_latency is None:
+                self.baseline_latency = latency
+            else:
+                self.baseline_latency = 0.9 * self.baseline_latency + 0.1 * latency
+
+    def record_failure(self, blocked=False):
+        with self._lock:
+            self.stats["failures"] += 1
+            if blocked:
+                self.stats["blocked"] += 1
+            self._decrease()
+
+    def call(self, func, *args, **kwargs):
+        """func를 실행하고 응답 시간 / 성공 여부로 속도를 조정 (acquire()로 순서를 받은 뒤 호출)"""
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except SearchFailedError as e:
+            self.record_failure(blocked=e.blocked)
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - started)
+        return result
+
+    def count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+            successes = stats.pop("successes")
+            latency_sec = stats.pop("latency_sec")
+            return {
+                "account": self.account_id,
+                "rate": round(self.rate, 3),
+                "min_rate": round(self.min_rate_seen, 3),
+                "max_rate": round(self.max_rate_seen, 3),
+                "successes": successes,
+                **{name: round(value, 3) if isinstance(value, float) else value for name, value in stats.items()},
+                "avg_latency_sec": round(latency_sec / successes, 3) if successes else None,
+                "baseline_latency_sec": round(self.baseline_latency, 3) if self.baseline_latency else None,
+                "rate_decreases": list(self.rate_history),
+            }
+
+    def print_summary(self):
+        metrics = self.metrics()
+        print(f"\n===== 검색 속도 제한 [{self.account_id}] =====")
+        print(f"현재 {metrics['rate']}회/초 (최소 {metrics['min_rate']} / 최대 {metrics['max_rate']}), "
+              f"평균 응답 {metrics['avg_latency_sec']}초, 대기 {metrics['throttle_wait_sec']}초")
+        print(f"성공 {metrics['successes']} | 실패 {metrics['failures']} (차단 {metrics['blocked']}) | "
+              f"느려짐 {metrics['slowdowns']} | 재시도 {metrics['retries']} | 포기 {metrics['given_up']}")
+        return metrics
+
+
+# 계정별 속도 제한 (같은 계정의 워커 스레드들이 하나를 공유)
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(account_id):
+    with _limiters_lock:
+        if account_id not in _limiters:
+            _limiters[account_id] = AdaptiveRateLimiter(account_id)
+        return _limiters[account_id]
+
+
+# 검색 작업: 재시도 횟수(attempt)와 다시 시도할 수 있는 시각(ready_at, time.monotonic 기준)
+SearchTask = namedtuple("SearchTask", "text dates attempt ready_at")
+
+
+def make_search_queue(search_dates):
+    """{검색어: [날짜, ...]}를 검색 작업 큐로 변환"""
+    task_queue = queue.Queue()
+    for text, dates in search_dates.items():
+        task_queue.put(SearchTask(text, dates, 0, 0.0))
+    return task_queue
+
+
+def drain_search_queue(task_queue, backend, limiter, on_result, label="", max_attempts=SEARCH_MAX_ATTEMPTS):
+    """
+    큐의 검색어를 속도 제한에 맞춰 검색하고 결과를 on_result(검색어, product_results)로 전달
+    실패한 검색어는 백오프 후 다시 시도하도록 큐 뒤에 넣고, max_attempts번 실패하면 포기
+    여러 스레드가 같은 큐를 함께 비울 수 있음, 포기한 검색어 목록을 반환
+    """
+    given_up = []
+    while True:
+        try:
+            task = task_queue.get_nowait()
+        except queue.Empty:
+            return given_up
+
+        # 재시도 작업은 백오프 시간이 지날 때까지 대기
+        delay = task.ready_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        # 토큰 대기 시간은 키워드 소요 시간에서 제외
+        limiter.acquire()
+
+        retry_note = f" (재시도 {task.attempt}회)" if task.attempt else ""
+        print(f"\n>>> {label}키워드 검색 시작: {task.text}{retry_note}")
+        try:
+            with PROFILER.keyword(task.text):
+                product_results = limiter.call(backend.fetch_results, task.text, task.dates)
+        except Exception as e:
+            attempt = task.attempt + 1
+            if attempt >= max_attempts:
+                print(f"{label}'{task.text}' {attempt}회 실패로 포기합니다: {e}")
+                limiter.count("given_up")
+                given_up.append(task.text)
+                continue
+
+            wait = backoff_delay(attempt)
+            print(f"{label}'{task.text}' 실패, {wait:.1f}초 후 다시 시도합니다: {e}")
+            limiter.count("retries")
+            task_queue.put(task._replace(attempt=attempt, ready_at=time.monotonic() + wait))
+            continue
+
+        on_result(task.text, product_results)
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+from datetime import datetime
+from config import RUN_JOURNAL_DIR
+
+
+def journal_path(user_id, journal_dir=RUN_JOURNAL_DIR):
+    return os.path.join(journal_dir, f"journal_{user_id}.jsonl")
+
+
+class RunJournal:
+    """
+    실행 중 수집한 순위를 한 줄씩 바로 기록하는 JSONL 선기록(write-ahead) 저널
+    - result: 검색어 하나의 결과 {"type": "result", "search": ..., "keywords": [...], "results": {"YYYY-MM-DD": [[kw, id, rank], ...]}}
+    - checkpoint: 여기까지의 결과가 엑셀 파일에 저장됨 {"type": "checkpoint", "cells": n}
+    정상 종료 시 삭제되고, 중간에 죽으면 남아서 --resume 시 엑셀에 다시 반영
+    """
+
+    def __init__(self, user_id, journal_dir=RUN_JOURNAL_DIR):
+        os.makedirs(journal_dir, exist_ok=True)
+        self.path = journal_path(user_id, journal_dir)
+        self._file = None
+        # 파이프라인 모드에서는 result는 메인 스레드, checkpoint는 기록 스레드가 씀
+        self._lock = threading.Lock()
+
+    def _write(self, entry):
+        entry["at"] = datetime.now().isoformat(timespec="seconds")
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            # 프로세스가 죽어도 기록이 남도록 바로 디스크에 반영
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def append(self, search_text, product_results, covered_keywords):
+        results = {
+            target_date.strftime('%Y-%m-%d'): [[kw, str(product_id), rank] for kw, product_id, rank in items]
+            for target_date, items in product_results.items()
+        }
+        self._write({"type": "result", "search": search_text,
+                     "keywords": list(covered_keywords), "results": results})
+
+    def checkpoint(self, cells_written):
+        self._write({"type": "checkpoint", "cells": cells_written})
+
+    def entries(self):
+        """저널의 기록을 순서대로 반환 (마지막 줄이 쓰다 만 줄이면 무시)"""
+        if not os.path.exists(self.path):
+            return []
+
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"저널의 손상된 줄을 건너뜁니다: {line[:80]!r}")
+        return entries
+
+    def result_entries(self):
+        """result 기록을 (검색어, 완료 키워드 목록, {datetime: [(kw, id, rank), ...]}) 형태로 반환"""
+        for entry in self.entries():
+            if entry.get("type") != "result":
+                continue
+            product_results = {
+                datetime.strptime(date_str, '%Y-%m-%d'): [tuple(item) for item in items]
+                for date_str, items in entry["results"].items()
+            }
+            yield entry["search"], entry["keywords"], product_results
+
+    def replay(self):
+        """
+        저널에 남은 결과를 (완료된 키워드 집합, {datetime: [(kw, id, rank), ...]})로 반환
+        체크포인트 이전 결과도 포함 (엑셀 저장이 끝났더라도 다시 기록해도 값은 같음)
+        """
+        done_keywords = set()
+        merged_results = {}
+        for _, keywords, product_results in self.result_entries():
+            done_keywords.update(keywords)
+            for target_date, items in product_results.items():
+                merged_results.setdefault(target_date, []).extend(items)
+        return done_keywords, merged_results
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """실행이 정상적으로 끝나 엑셀에 모두 저장되면 저널 삭제"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,78 @@
+import json
+import os
+import time
+from config import (
+    PROFILE_ROOT_DIR,
+    TOP_ADS_URL,
+    SESSION_EXPIRY_MARGIN_SEC,
+    SESSION_DEFAULT_TTL_SEC,
+)
+
+
+class SessionCache:
+    """
+    로그인 쿠키와 만료 시각을 로컬 파일에 저장해 두고, 프로필에서 쿠키가 사라졌을 때 복원
+    만료 시각이 margin_sec 이내로 다가오면 사용하지 않고 미리 폐기합니다.
+    """
+
+    def __init__(self, user_id, path=None, margin_sec=SESSION_EXPIRY_MARGIN_SEC):
+        self.user_id = user_id
+        self.path = path or os.path.join(PROFILE_ROOT_DIR, f"{user_id}_session.json")
+        self.margin_sec = margin_sec
+
+    def save(self, cookies):
+        now = time.time()
+        expiries = [cookie["expiry"] for cookie in cookies if cookie.get("expiry")]
+        expires_at = min(expiries) if expiries else now + SESSION_DEFAULT_TTL_SEC
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"user_id": self.user_id, "saved_at": now, "expires_at": expires_at, "cookies": cookies},
+                      f, ensure_ascii=False)
+
+    def load(self):
+        """저장된 쿠키 목록 (없거나 만료 임박이면 None)"""
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.drop()
+            return None
+
+        if time.time() >= data.get("expires_at", 0) - self.margin_sec:
+            print(f"[{self.user_id}] 저장된 세션이 곧 만료되어 폐기합니다.")
+            self.drop()
+            return None
+
+        return data.get("cookies") or None
+
+    def drop(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def apply_cookies(driver, cookies):
+    """
+    저장된 쿠키 중 브라우저에 없거나 값이 다른 쿠키(비로그인 / 만료된 세션 쿠키)를 DevTools로 설정하고 개수를 반환
+    페이지 이동 없이 적용되므로 이어서 is_top_logged_in이 광고 페이지를 한 번만 열면 됨
+    """
+    existing = {cookie["name"]: cookie.get("value")
+                for cookie in driver.execute_cdp_cmd("Network.getCookies", {"urls": [TOP_ADS_URL]})["cookies"]}
+    changed = []
+    for cookie in cookies:
+        if existing.get(cookie["name"]) == cookie["value"]:
+            continue
+        cdp_cookie = {key: value for key, value in cookie.items()
+                      if key in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")}
+        if cookie.get("expiry"):
+            cdp_cookie["expires"] = cookie["expiry"]
+        if not cdp_cookie.get("domain"):
+            cdp_cookie["url"] = TOP_ADS_URL
+        changed.append(cdp_cookie)
+
+    if changed:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": changed})
+    return len(changed)
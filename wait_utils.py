@@ -0,0 +1,126 @@
+import threading
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.wait import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from config import CAPTURE_URL_PATTERN
+
+
+class WaitStats:
+    """이벤트 대기에 실제로 걸린 시간을 이름별로 기록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = {}      # {"search_refresh": [0.42, 0.38, ...]}
+        self.timeouts = {}     # {"search_refresh": 1}
+
+    def record(self, name, seconds, timed_out=False):
+        with self._lock:
+            self.records.setdefault(name, []).append(seconds)
+            if timed_out:
+                self.timeouts[name] = self.timeouts.get(name, 0) + 1
+
+    def summary(self):
+        with self._lock:
+            return {
+                name: {
+                    "count": len(values),
+                    "total": sum(values),
+                    "avg": sum(values) / len(values),
+                    "max": max(values),
+                    "timeouts": self.timeouts.get(name, 0),
+                }
+                for name, values in self.records.items() if values
+            }
+
+    def print_summary(self):
+        for name, info in self.summary().items():
+            print(f"[WAIT] {name}: {info['count']}회, 평균 {info['avg']:.2f}초, 최대 {info['max']:.2f}초, "
+                  f"합계 {info['total']:.1f}초, 타임아웃 {info['timeouts']}회")
+
+
+WAIT_STATS = WaitStats()
+
+
+def timed_wait(driver, name, condition, timeout, poll_frequency=0.1):
+    """
+    WebDriverWait(condition)을 실행하고 대기 시간을 WAIT_STATS에 기록
+    타임아웃이면 TimeoutException을 그대로 전달
+    """
+    started = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+    except TimeoutException:
+        WAIT_STATS.record(name, time.perf_counter() - started, timed_out=True)
+        raise
+
+    WAIT_STATS.record(name, time.perf_counter() - started)
+    return result
+
+
+# 현재 결과 테이블 상태 (행 수 + 앞부분 텍스트)
+TABLE_SIGNATURE_SCRIPT = """
+const tbody = document.querySelector("tbody");
+if (!tbody) return null;
+return tbody.rows.length + "|" + (tbody.innerText || "").slice(0, 300);
+"""
+
+
+# 클릭 직전 시각 (이후 시작된 fetch / XHR 요청을 찾기 위한 기준, Resource Timing 버퍼가 차지 않도록 크기 확장)
+REQUEST_MARK_SCRIPT = """
+performance.setResourceTimingBufferSize(10000);
+return performance.now();
+"""
+
+# 기준 시각 이후 시작된 검색 요청(URL이 arguments[1] 정규식에 맞는 fetch / XHR) 중 응답까지 끝난 것이 있는지
+# (Resource Timing 항목은 응답이 끝나야 생김, 관계없는 백그라운드 요청은 제외)
+REQUEST_DONE_SCRIPT = """
+const since = arguments[0];
+const pattern = new RegExp(arguments[1]);
+return performance.getEntriesByType("resource").some(e =>
+    (e.initiatorType === "fetch" || e.initiatorType === "xmlhttprequest") && e.startTime >= since
+    && pattern.test(e.name));
+"""
+
+
+def get_table_state(driver):
+    """검색 전 테이블 상태 (tbody 요소, 시그니처, 요청 기준 시각)"""
+    tbodies = driver.find_elements(By.XPATH, "//tbody")
+    old_tbody = tbodies[0] if tbodies else None
+    return old_tbody, driver.execute_script(TABLE_SIGNATURE_SCRIPT), driver.execute_script(REQUEST_MARK_SCRIPT)
+
+
+def wait_for_table_refresh(driver, old_state, timeout=3, settle=0.3, request_pattern=CAPTURE_URL_PATTERN):
+    """
+    이전 tbody가 stale 되거나 행 수 / 내용이 바뀔 때까지 대기 (바뀌면 True)
+    같은 결과가 다시 그려진 경우처럼 변화가 없으면 False:
+    검색 요청(URL이 request_pattern에 맞는 fetch / XHR)의 응답이 끝나고 settle초 동안 그대로면 바로 진행,
+    요청을 확인할 수 없으면 timeout 후 진행
+    """
+    old_tbody, old_signature, request_mark = old_state
+    request_done_at = None
+
+    def table_refreshed(drv):
+        nonlocal request_done_at
+        if old_tbody is not None:
+            try:
+                old_tbody.is_enabled()
+            except StaleElementReferenceException:
+                return True
+
+        signature = drv.execute_script(TABLE_SIGNATURE_SCRIPT)
+        if signature is not None and signature != old_signature:
+            return True
+
+        # 응답을 받은 뒤 화면에 그릴 시간(settle)까지 기다려도 그대로면 결과가 같은 것으로 판단
+        if request_mark is not None:
+            if request_done_at is None and drv.execute_script(REQUEST_DONE_SCRIPT, request_mark, request_pattern):
+                request_done_at = time.perf_counter()
+            if request_done_at is not None and time.perf_counter() - request_done_at >= settle:
+                return "unchanged"
+        return False
+
+    try:
+        return timed_wait(driver, "search_refresh", table_refreshed, timeout) is True
+    except TimeoutException:
+        return False
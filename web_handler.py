@@ -1,6 +1,9 @@
 import time
 import random
 import os
+import json
+import itertools
+from contextlib import contextmanager
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
@@ -8,25 +11,165 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.select import Select
+from selenium.common.exceptions import TimeoutException, SessionNotCreatedException
 from datetime import datetime
-from config import PROFILE_ROOT_DIR, TOP_ADS_URL
+from config import (
+    PROFILE_ROOT_DIR,
+    TOP_ADS_URL,
+    CHROMEDRIVER_CACHE_PATH,
+    CHROME_CACHE_DIRS,
+    HEADLESS,
+    FAST_RENDER,
+    PAGE_LOAD_STRATEGY,
+    BLOCKED_URL_PATTERNS,
+    FETCH_BACKEND,
+    LOGIN_MAX_RETRIES,
+    SESSION_CACHE_ENABLED,
+    RESULT_PAGINATION,
+    RESULT_MAX_PAGES,
+    RESULT_NEXT_PAGE_XPATH,
+    RESULT_PAGE_SIZE_SELECT_XPATH,
+)
+from date_matcher import DateRangeMatcher
+from instrumentation import timed_phase, instrument_driver
+from wait_utils import timed_wait, get_table_state, wait_for_table_refresh
+from session_cache import SessionCache, apply_cookies
+from network_capture import enable_performance_logging
+from request_scheduler import backoff_delay, SearchFailedError
 import shutil  # 폴더 삭제를 위해
 
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
 
 
-def create_driver(user_id, headless: bool = False) -> webdriver.Chrome:
+
+@contextmanager
+def _process_file_lock(lock_path, timeout=300):
+    """
+    여러 프로세스(multi_account_runner) 사이의 잠금
+    OS 파일 잠금이라 잠근 프로세스가 죽으면 자동으로 풀림
+    """
+    with open(lock_path, "a+b") as f:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if os.name == "nt":
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"잠금 대기 시간 초과: {lock_path}")
+                time.sleep(0.2)
+
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _read_chromedriver_cache():
+    """저장된 chromedriver 경로 (없거나 파일이 사라졌으면 None)"""
+    if not os.path.exists(CHROMEDRIVER_CACHE_PATH):
+        return None
+    try:
+        with open(CHROMEDRIVER_CACHE_PATH, encoding="utf-8") as f:
+            cached_path = json.load(f).get("path")
+    except (OSError, ValueError) as e:
+        print(f"chromedriver 경로 캐시를 읽지 못했습니다: {e}")
+        return None
+    return cached_path if cached_path and os.path.exists(cached_path) else None
+
+
+def get_chromedriver_path(refresh: bool = False) -> str:
+    """
+    ChromeDriverManager가 설치한 chromedriver 경로를 로컬 파일에 저장해 두고 재사용
+    (버전 확인 / 다운로드를 위한 네트워크 접근 없이 시작)
+    여러 계정 프로세스가 동시에 설치 / 캐시 파일 쓰기를 하지 않도록 설치는 잠금 안에서 한 프로세스씩 진행
+    """
+    if not refresh:
+        cached_path = _read_chromedriver_cache()
+        if cached_path:
+            return cached_path
+
+    with _process_file_lock(CHROMEDRIVER_CACHE_PATH + ".lock"):
+        # 잠금을 기다리는 동안 다른 프로세스가 설치를 마쳤으면 그 경로 사용
+        if not refresh:
+            cached_path = _read_chromedriver_cache()
+            if cached_path:
+                return cached_path
+
+        driver_path = ChromeDriverManager().install()
+        # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = f"{CHROMEDRIVER_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"path": driver_path, "installed_at": datetime.now().isoformat()}, f, ensure_ascii=False)
+        os.replace(temp_path, CHROMEDRIVER_CACHE_PATH)
+    return driver_path
+
+
+def block_page_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    """DevTools로 이미지 / 폰트 / 스타일시트 / 미디어 요청을 차단 (드라이버 세션이 유지되는 동안 적용)"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+@timed_phase("create_driver")
+def create_driver(user_id, headless: bool = HEADLESS, debugger_address: str = None,
+                  remote_debugging_port: int = None, fast_render: bool = FAST_RENDER,
+                  page_load_strategy: str = PAGE_LOAD_STRATEGY,
+                  capture_network: bool = FETCH_BACKEND == "capture") -> webdriver.Chrome:
+    """
+    debugger_address: 이미 실행 중인 크롬("127.0.0.1:9222")에 연결 (브라우저 데몬)
+    remote_debugging_port: 다른 실행이 붙을 수 있도록 원격 디버깅 포트를 열고 실행
+    fast_render: 이미지 / 폰트 / 스타일시트 / 미디어 요청 차단
+    page_load_strategy: driver.get()이 기다리는 범위 ("normal" / "eager" / "none")
+    capture_network: 응답 캡처 백엔드용 performance 로그(DevTools Network 이벤트) 수집
+    """
     options = Options()
-    user_data_path = os.path.join(PROFILE_ROOT_DIR, user_id)
-    options.add_argument(f"--user-data-dir={user_data_path}")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option("useAutomationExtension", False)
+    options.page_load_strategy = page_load_strategy
+    if capture_network:
+        enable_performance_logging(options)
+    if debugger_address:
+        # 이미 실행 중인 크롬에 붙는 경우 실행 옵션(헤드리스 / 프로필)은 적용할 수 없음
+        options.debugger_address = debugger_address
+    else:
+        user_data_path = os.path.join(PROFILE_ROOT_DIR, user_id)
+        options.add_argument(f"--user-data-dir={user_data_path}")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        if remote_debugging_port:
+            options.add_argument(f"--remote-debugging-port={remote_debugging_port}")
+        if headless:
+            # 새 헤드리스 모드는 일반 크롬과 같은 렌더러를 사용 (창 크기는 직접 지정)
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1300,900")
+        if fast_render:
+            # 이미지는 프로필 설정으로도 차단 (DevTools 차단 이전에 시작된 요청 포함)
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.set_window_size(1300, 900)
-    return driver
+    try:
+        driver = webdriver.Chrome(service=Service(get_chromedriver_path()), options=options)
+    except SessionNotCreatedException as e:
+        # 크롬이 업데이트되어 캐시된 chromedriver 버전이 맞지 않는 경우 다시 설치
+        print(f"캐시된 chromedriver로 실행 실패, 다시 설치합니다: {e.msg}")
+        driver = webdriver.Chrome(service=Service(get_chromedriver_path(refresh=True)), options=options)
+
+    if not debugger_address and not headless:
+        driver.set_window_size(1300, 900)
+    if fast_render:
+        block_page_resources(driver)
+    return instrument_driver(driver)
 
 
 def type_like_human(element, text):
@@ -42,36 +185,36 @@ def login_top_with_send_keys(driver, account, debug: bool = True):
             print(f"로그인 시도: {account}")
 
         driver.get(TOP_ADS_URL)
-        time.sleep(2)
 
-        id_ele = driver.find_element(By.XPATH, '//label[contains(text(), "아이디")]/following-sibling::input')
+        # 로그인 폼이 나타날 때까지 대기
+        id_ele = timed_wait(driver, "login_form", EC.visibility_of_element_located(
+            (By.XPATH, '//label[contains(text(), "아이디")]/following-sibling::input')), 10)
         pw_ele = driver.find_element(By.XPATH, '//label[contains(text(), "비밀번호")]/following-sibling::input')
 
         # ID 한 글자씩 타이핑
         id_ele.clear()
-        time.sleep(0.5)
-
         id_ele.click()
         type_like_human(id_ele, account["user_id"])
-        time.sleep(1)
 
         # PW 한 글자씩 타이핑
         pw_ele.clear()
-        time.sleep(0.5)
-
         pw_ele.click()
         type_like_human(pw_ele, account["user_pw"])
-        time.sleep(1)
 
         # 로그인 상태 유지 버튼 클릭
         keep_ele = driver.find_element(By.ID, "remember")
         keep_ele.click()
-        time.sleep(1)
 
-        # 로그인 버튼 클릭
+        # 로그인 버튼 클릭 후 로그인 버튼이 사라질 때까지 대기 (페이지 전환 / 로그아웃 버튼 표시)
         login_btn = driver.find_element(By.XPATH, '//button[contains(text(), "로그인")]')
         login_btn.click()
-        time.sleep(3)
+        try:
+            timed_wait(driver, "login_submit", EC.any_of(
+                EC.staleness_of(login_btn),
+                EC.presence_of_element_located((By.XPATH, '//button[contains(text(), "로그아웃")]'))), 10)
+        except TimeoutException:
+            if debug:
+                print("[LOGIN] 로그인 버튼 클릭 후 화면 변화가 없습니다.")
 
         return True
 
@@ -84,20 +227,21 @@ def login_top_with_send_keys(driver, account, debug: bool = True):
 def is_top_logged_in(driver, timeout: int = 3) -> bool:
 
     driver.get("https://top.re.kr/ads")
-    wait = WebDriverWait(driver, timeout)
+
+    # 로그아웃 / 로그인 버튼 중 하나가 나타나는 즉시 판단 (timeout까지 고정 대기하지 않음)
+    try:
+        timed_wait(driver, "login_state", EC.any_of(
+            EC.presence_of_element_located((By.XPATH, '//button[contains(text(), "로그아웃")]')),
+            EC.presence_of_element_located((By.XPATH, '//button[contains(text(), "로그인")]'))), timeout)
+    except TimeoutException:
+        pass
 
     # 1) 로그아웃 버튼이 '보이면' 로그인 상태로 판단
     try:
-        logout_btn = wait.until(
-            EC.presence_of_element_located(
-                (By.XPATH, '//button[contains(text(), "로그아웃")]')
-            )
-        )
-        if logout_btn.is_displayed():
+        logout_btns = driver.find_elements(By.XPATH, '//button[contains(text(), "로그아웃")]')
+        if logout_btns and logout_btns[0].is_displayed():
             print("로그아웃 버튼이 보여서, 로그인 상태로 판단합니다.")
             return True
-    except TimeoutException:
-        pass
     except Exception as e:
         print("로그아웃 버튼 확인 중 예외 발생:", e)
 
@@ -115,20 +259,48 @@ def is_top_logged_in(driver, timeout: int = 3) -> bool:
     return False
 
 
-def login_success_check(driver, account):
+def restore_session_cookies(driver, cache) -> bool:
+    """
+    저장된 세션 쿠키를 브라우저에 복원하고, 새로 적용한 쿠키가 있으면 True
+    로그인 여부는 따로 확인하지 않음 (이어지는 is_top_logged_in이 한 번에 판단)
+    """
+    cookies = cache.load()
+    if not cookies:
+        return False
+    return apply_cookies(driver, cookies) > 0
+
+
+@timed_phase("login")
+def login_success_check(driver, account, use_session_cache: bool = SESSION_CACHE_ENABLED):
     user_id = account['user_id']
+    cache = SessionCache(user_id) if use_session_cache else None
+
+    restored = False
+    if cache is not None:
+        try:
+            restored = restore_session_cookies(driver, cache)
+            if restored:
+                print(f"[{user_id}] 저장된 세션 쿠키를 브라우저에 복원했습니다.")
+        except Exception as e:
+            print(f"저장된 세션 복원 중 에러: {e}")
 
     try:
         if is_top_logged_in(driver, 3):
             print(f"[{user_id}] 이미 로그인되어 있습니다.")
+            if cache is not None:
+                cache.save(driver.get_cookies())
             return True
     except Exception as e:
         print(f"로그인 상태 확인 중 에러: {e}")
 
+    if restored:
+        print(f"[{user_id}] 복원한 세션이 유효하지 않아 폐기합니다.")
+        cache.drop()
+
     print(f"[{user_id}] 로그인 세션이 없습니다. 로그인을 시도합니다.")
 
     # 한 계정 당 최대 로그인 재시도 횟수 설정
-    MAX_RETRIES = 3
+    MAX_RETRIES = LOGIN_MAX_RETRIES
 
     for attempt in range(1, MAX_RETRIES + 1):
         print(f"로그인 시도 {attempt}/{MAX_RETRIES}회 진행 중...")
@@ -139,6 +311,8 @@ def login_success_check(driver, account):
             # 로그인 성공 여부 확인
             if is_top_logged_in(driver, 5):
                 print(f"[{user_id}] 로그인 성공! 작업을 시작합니다.")
+                if cache is not None:
+                    cache.save(driver.get_cookies())
                 return True
 
         except Exception as e:
@@ -146,7 +320,7 @@ def login_success_check(driver, account):
 
         if attempt < MAX_RETRIES:
             print(f"[{user_id}] 로그인 실패. {attempt+1}회차 재시도를 위해 대기합니다.")
-            time.sleep(3)  # 너무 빠른 재시도는 차단 위험이 있음
+            time.sleep(backoff_delay(attempt))  # 너무 빠른 재시도는 차단 위험이 있음 (지수 증가 + 지터)
         else:
             print(f"[{user_id}] 모든 재시도 횟수를 소진했습니다.")
 
@@ -154,7 +328,13 @@ def login_success_check(driver, account):
     return False
 
 
-def search_keyword(driver, keyword: str, timeout: int = 10):
+@timed_phase("search_keyword")
+def search_keyword(driver, keyword: str, timeout: int = 10, refresh_timeout: int = 3) -> bool:
+    """
+    키워드 검색 후 결과 테이블이 갱신될 때까지(이전 tbody stale / 행 수·내용 변경) 대기
+    검색 결과가 이전과 같아 변화가 없으면 검색 요청의 응답이 끝난 직후 진행 (요청을 확인할 수 없으면 refresh_timeout 후)
+    검색창 / 버튼을 찾지 못하는 등 검색에 실패하면 False
+    """
     try:
         wait = WebDriverWait(driver, timeout)
 
@@ -165,17 +345,245 @@ def search_keyword(driver, keyword: str, timeout: int = 10):
         search_input.send_keys(keyword)
 
         search_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), '검색')]")))
-        driver.execute_script("arguments[0].click();", search_button)
 
-        time.sleep(1.5)
+        # 검색 전 테이블 상태를 저장해 두고, 클릭 후 갱신될 때까지 대기
+        old_state = get_table_state(driver)
+        driver.execute_script("arguments[0].click();", search_button)
+        wait_for_table_refresh(driver, old_state, refresh_timeout)
         print(f"'{keyword}' 검색 완료")
+        return True
 
     except Exception as e:
         print(f"키워드 검색 중 오류 발생: {e}")
+        return False
+
+
+# 결과 테이블(tbody)의 모든 행을 한 번의 execute_script 호출로 가져오는 스크립트
+# 각 행: {"cells": [td 텍스트, ...], "href": td[8] 안의 링크 주소}
+TABLE_ROWS_SCRIPT = """
+const rows = document.evaluate("//tbody/tr", document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const result = [];
+for (let i = 0; i < rows.snapshotLength; i++) {
+    const tds = rows.snapshotItem(i).querySelectorAll(":scope > td");
+    const link = tds.length > 7 ? tds[7].querySelector("a") : null;
+    result.push({
+        cells: Array.from(tds, td => (td.innerText || "").trim()),
+        href: link ? link.getAttribute("href") : null
+    });
+}
+return result;
+"""
+
+
+def fetch_table_rows(driver):
+    """결과 테이블의 모든 행을 [{"cells": [...], "href": ...}, ...] 형태로 반환 (WebDriver 왕복 1회)"""
+    return driver.execute_script(TABLE_ROWS_SCRIPT) or []
+
+
+def raise_page_size(driver, refresh_timeout: int = 3) -> bool:
+    """
+    페이지당 행 수 선택 박스가 있으면 가장 큰 값으로 변경 (페이지 이동 횟수 감소)
+    변경했으면 True
+    """
+    selects = driver.find_elements(By.XPATH, RESULT_PAGE_SIZE_SELECT_XPATH)
+    if not selects:
+        return False
+
+    select = Select(selects[0])
+    sizes = [(int(option.get_attribute("value")), option.get_attribute("value"))
+             for option in select.options if (option.get_attribute("value") or "").isdigit()]
+    if not sizes:
+        return False
+
+    largest = max(sizes)
+    if select.first_selected_option.get_attribute("value") == largest[1]:
+        return False
+
+    old_state = get_table_state(driver)
+    select.select_by_value(largest[1])
+    wait_for_table_refresh(driver, old_state, refresh_timeout)
+    print(f"페이지당 행 수를 {largest[0]}개로 변경했습니다.")
+    return True
+
+
+def go_to_next_page(driver, refresh_timeout: int = 10, keyword: str = "") -> bool:
+    """
+    다음 페이지 버튼을 눌러 테이블이 갱신되면 True, 버튼이 없거나 비활성이면(마지막 페이지) False
+    눌렀는데 테이블이 갱신되지 않으면 SearchFailedError (느린 페이지를 마지막 페이지로 보고 결과를 자르지 않도록)
+    """
+    buttons = driver.find_elements(By.XPATH, RESULT_NEXT_PAGE_XPATH)
+    if not buttons:
+        return False
+
+    button = buttons[0]
+    classes = button.get_attribute("class") or ""
+    parent_classes = button.find_element(By.XPATH, "..").get_attribute("class") or ""
+    if button.get_attribute("disabled") is not None or "disabled" in classes or "disabled" in parent_classes:
+        return False
+
+    old_state = get_table_state(driver)
+    driver.execute_script("arguments[0].click();", button)
+    if not wait_for_table_refresh(driver, old_state, refresh_timeout):
+        raise SearchFailedError(keyword, "다음 페이지를 눌렀지만 결과 테이블이 갱신되지 않음")
+    return True
+
+
+def iter_result_rows(driver, max_pages: int = RESULT_MAX_PAGES, keyword: str = ""):
+    """
+    결과 테이블의 행을 페이지를 넘기며 하나씩 반환하는 제너레이터
+    다음 페이지는 현재 페이지의 행을 모두 소비한 뒤에만 불러오므로,
+    collect_product_results가 종료일 기준으로 탐색을 멈추면 이후 페이지는 요청하지 않음
+    페이지 이동 중 오류가 나면 SearchFailedError (일부 페이지만 읽은 결과를 수집 완료로 기록하지 않도록)
+    """
+    page = 1
+    yield from fetch_table_rows(driver)
+
+    while page < max_pages:
+        try:
+            if not go_to_next_page(driver, keyword=keyword):
+                return
+            page_rows = fetch_table_rows(driver)
+        except SearchFailedError:
+            print(f"{page + 1}페이지 결과 테이블이 갱신되지 않았습니다.")
+            raise
+        except Exception as e:
+            print(f"{page + 1}페이지 이동 중 오류 발생: {e}")
+            raise SearchFailedError(keyword, f"{page + 1}페이지 이동 실패 ({e})") from e
+
+        page += 1
+        yield from page_rows
+
+
+def parse_rank_text(rank_text):
+    """'12위' → '12', '순위밖' 등은 빈 문자열"""
+    if "순위밖" not in rank_text and "위" in rank_text:
+        return rank_text.split('위')[0].strip()
+    return ""
+
+
+def is_empty_result_row(table_row):
+    """'조회된 정보가 없습니다' 안내 행인지 확인"""
+    return len(table_row["cells"]) < 13 and "정보가 없습니다" in " ".join(table_row["cells"])
+
+
+def table_row_to_record(table_row):
+    """
+    결과 테이블 행({"cells": [...], "href": ...})을 레코드로 변환
+    레코드: {"keyword", "product_id", "rank", "start_date", "end_date"} (날짜는 'YYYY-MM-DD' 텍스트)
+    """
+    cells = table_row["cells"]
+    href = table_row["href"]
+    return {
+        "keyword": cells[5].strip(),
+        "product_id": href.split("=")[-1] if href else None,
+        "rank": parse_rank_text(cells[8].strip()),
+        "start_date": cells[11].strip()[:10],  # (아이콘 제거)
+        "end_date": cells[12].strip()[:10],    # (아이콘 제거)
+    }
+
+
+def iter_records(rows, to_record):
+    """행을 하나씩 레코드로 변환 (변환에 실패한 행은 건너뜀, 제너레이터라 중간에 멈출 수 있음)"""
+    for row in rows:
+        try:
+            yield to_record(row)
+        except Exception as e:
+            print(f"행 처리 중 오류: {e}")
+
+
+def collect_records(records, target_dates: list):
+    """
+    레코드 목록에서 날짜 매칭, 중복 제거를 처리
+    반환: {datetime: [(row_keyword, product_id, rank_number), ...]}
+    """
+    # 타겟 날짜 텍스트를 datetime 객체로 변환 (리스트)
+    target_datetimes = [datetime.strptime(target_date, '%Y-%m-%d') for target_date in target_dates]
+    matcher = DateRangeMatcher(target_datetimes)
+    product_results = matcher.results
+
+    for record in records:
+        try:
+            start_date = datetime.strptime(record["start_date"], '%Y-%m-%d')
+            end_date = datetime.strptime(record["end_date"], '%Y-%m-%d')
+
+            # 종료일이 지났으면(타겟 날짜에 해당하는 기간이 없으면) 중단
+            if end_date < matcher.min_target:
+                print(f"종료일({record['end_date']})이 지났으므로 탐색 종료")
+                break   # break 로직은 데이터가 날짜순일 때만 유효
+
+            # 시작일이 아직 안왔거나 기간에 포함되는 타겟 날짜가 없으면 다음 행으로 이동
+            if start_date > matcher.max_target or not matcher.dates_in_range(start_date, end_date):
+                continue
+
+            row_keyword = record["keyword"]
+            product_id = record["product_id"]
+            rank_number = record["rank"]
+            if not product_id:
+                print(f"상품 번호가 없는 행을 건너뜁니다: {row_keyword}")
+                continue
+
+            # 기간에 포함되는 날짜마다 기록 (날짜별 키워드 & 상품 번호 중복 제외)
+            for target_datetime in matcher.add(start_date, end_date, row_keyword, product_id, rank_number):
+                print(f"매칭 발견: {target_datetime} | 키워드: {row_keyword} | ID: {product_id} | 순위: {rank_number}")
+
+        except Exception as e:
+            # 개별 행 파싱 실패 시 다음 행으로 진행
+            print(f"행 처리 중 오류: {e}")
+            continue
+
+    return product_results
+
+
+def collect_product_results(table_rows, target_dates: list):
+    """
+    fetch_table_rows 형태의 행 목록에서 날짜 매칭, 순위 파싱, 중복 제거를 Python에서 처리
+    반환: {datetime: [(row_keyword, product_id, rank_number), ...]}
+    """
+    # '조회 결과 없음' 문구가 있는 경우 처리 (제너레이터도 받을 수 있도록 첫 행만 미리 확인)
+    table_rows = iter(table_rows)
+    first_row = next(table_rows, None)
+    if first_row is None or is_empty_result_row(first_row):
+        print("조회 결과 없음 (표시된 데이터가 없습니다)")
+        return collect_records([], target_dates)
+
+    return collect_records(iter_records(itertools.chain([first_row], table_rows), table_row_to_record), target_dates)
 
 
 # target_dates = ['2026-01-07', '2026-01-08'] (텍스트 형식, 반드시 날짜 순서 유지해야 함, 오늘 날짜까지만!)
-def extract_product_results(driver, target_dates: list, timeout: int = 10):
+@timed_phase("extract_product_results")
+def extract_product_results(driver, target_dates: list, timeout: int = 10, bulk: bool = True,
+                            paginate: bool = RESULT_PAGINATION, keyword: str = ""):
+    """
+    bulk=True: tbody 전체를 execute_script 한 번으로 읽고 Python에서 파싱
+    paginate=True: 다음 페이지까지 이어서 읽되, 종료일이 타겟 날짜보다 이전인 행이 나오면 중단
+    bulk=False 또는 일괄 추출 실패 시: 행/셀마다 find_element로 읽는 기존 방식
+    테이블이 뜨지 않거나 읽지 못하면 SearchFailedError (빈 결과는 '정보가 없습니다' 행일 때만)
+    """
+    if bulk:
+        wait = WebDriverWait(driver, timeout)
+        try:
+            wait.until(EC.presence_of_all_elements_located((By.XPATH, "//tbody/tr")))
+        except TimeoutException as e:
+            print(f"테이블 처리 중 오류 발생: {e}")
+            raise SearchFailedError(keyword, "결과 테이블이 표시되지 않음 (시간 초과)") from e
+
+        try:
+            if paginate:
+                raise_page_size(driver)
+                table_rows = iter_result_rows(driver, keyword=keyword)
+            else:
+                table_rows = fetch_table_rows(driver)
+            return collect_product_results(table_rows, target_dates)
+        except SearchFailedError:
+            # 다음 페이지로 넘어간 뒤라 현재 화면만 다시 읽으면 결과가 빠짐
+            raise
+        except Exception as e:
+            print(f"테이블 일괄 추출 실패, 행 단위 추출로 전환합니다: {e}")
+
+    return extract_product_results_per_element(driver, target_dates, timeout, keyword)
+
+
+def extract_product_results_per_element(driver, target_dates: list, timeout: int = 10, keyword: str = ""):
     wait = WebDriverWait(driver, timeout)
 
     # 타겟 날짜 텍스트를 datetime 객체로 변환 (리스트)
@@ -225,9 +633,7 @@ def extract_product_results(driver, target_dates: list, timeout: int = 10):
                             continue
 
                         rank_text = row.find_element(By.XPATH, "./td[9]").text.strip()
-                        rank_number = ""
-                        if "순위밖" not in rank_text and "위" in rank_text:
-                            rank_number = rank_text.split('위')[0].strip()
+                        rank_number = parse_rank_text(rank_text)
 
                         product_results[target_datetimes[i]].append((row_keyword, product_id, rank_number))
                         print(f"매칭 발견: {target_datetime} | 키워드: {row_keyword} | ID: {product_id} | 순위: {rank_number}")
@@ -239,11 +645,13 @@ def extract_product_results(driver, target_dates: list, timeout: int = 10):
 
     except Exception as e:
         print(f"테이블 처리 중 오류 발생: {e}")
+        raise SearchFailedError(keyword, f"결과 테이블 처리 실패 ({e})") from e
 
     return product_results
 
 
 
+@timed_phase("cache_cleanup")
 def delete_chrome_cache(user_id):
     target_profile_path = os.path.join(PROFILE_ROOT_DIR, user_id)
 
@@ -254,16 +662,7 @@ def delete_chrome_cache(user_id):
     print(f"\n[Cache Cleanup] Start: {target_profile_path}")
 
     # 삭제할 하위 폴더 목록 (Default 내부 및 공통 캐시)
-    target_folders = [
-        os.path.join("Default", "Cache"),
-        os.path.join("Default", "Code Cache"),
-        os.path.join("Default", "GPUCache"),
-        "component_crx_cache",
-        "GrShaderCache",
-        "optimization_guide_model_store"
-    ]
-
-    for sub_folder in target_folders:
+    for sub_folder in CHROME_CACHE_DIRS:
         full_folder_path = os.path.join(target_profile_path, sub_folder)
 
         # 폴더가 실제로 있을 때만 삭제 시도
@@ -295,7 +694,7 @@ if __name__ == "__main__":
     keywords = get_keyword_from_xlsm()
 
     # 드라이버 실행
-    driver = create_driver(account["user_id"], headless=False)
+    driver = create_driver(account["user_id"])
 
     try:
         # 로그인 상태 확인
@@ -305,7 +704,7 @@ if __name__ == "__main__":
                 search_keyword(driver, keyword)
 
                 # 웹 페이지에서 키워드, VI ID, 순위 추출 (딕셔너리 형태)
-                product_results = extract_product_results(driver, target_dates)
+                product_results = extract_product_results(driver, target_dates, keyword=keyword)
 
                 # 추출된 결과(키워드, ID, 순위) 출력
                 # {datetime(2026, 1, 7): [('keyword1', 'ID_1', '3'), ('keyword2', 'ID_1', '10')], datetime(2026, 1, 8): [('keyword1', 'ID_1', '3')]}
@@ -0,0 +1,132 @@
+import os
+import queue
+import shutil
+import threading
+from config import PROFILE_ROOT_DIR, SCRAPE_CONCURRENCY, HEADLESS, PIPELINE_QUEUE_SIZE
+from web_handler import create_driver, login_success_check
+from fetch_backend import create_fetch_backend
+from instrumentation import PROFILER, sample_browser_metrics
+from request_scheduler import get_rate_limiter, make_search_queue, drain_search_queue
+
+
+# 같은 user-data-dir은 크롬 하나만 쓸 수 있으므로 워커마다 복제한 프로필을 사용
+# 잠금 파일과 캐시는 복제하지 않음
+PROFILE_CLONE_IGNORE = shutil.ignore_patterns(
+    "Singleton*", "lockfile", "Cache", "Code Cache", "GPUCache", "GrShaderCache",
+    "component_crx_cache", "optimization_guide_model_store"
+)
+
+# ChromeDriverManager 설치 / 크롬 실행이 동시에 일어나지 않도록 보호
+_driver_lock = threading.Lock()
+
+
+def clone_profile(user_id, worker_no):
+    """
+    원본 프로필(로그인 쿠키 포함)을 워커용 프로필 폴더로 복제하고 프로필 이름을 반환
+    0번 워커는 원본 프로필을 그대로 사용
+    """
+    if worker_no == 0:
+        return user_id
+
+    worker_profile = f"{user_id}_worker{worker_no}"
+    src = os.path.join(PROFILE_ROOT_DIR, user_id)
+    dst = os.path.join(PROFILE_ROOT_DIR, worker_profile)
+
+    if os.path.exists(src):
+        shutil.copytree(src, dst, ignore=PROFILE_CLONE_IGNORE, dirs_exist_ok=True)
+    return worker_profile
+
+
+def _scrape_worker(worker_no, profile_name, account, keyword_queue, result_queue, headless):
+    try:
+        with _driver_lock:
+            driver = create_driver(profile_name, headless=headless)
+    except Exception as e:
+        print(f"[워커 {worker_no}] 브라우저 실행 실패로 종료합니다: {e}")
+        return
+
+    try:
+        if not login_success_check(driver, account):
+            print(f"[워커 {worker_no}] 로그인 실패로 종료합니다.")
+            return
+
+        def on_result(keyword, product_results):
+            PROFILER.record_browser(keyword, sample_browser_metrics(driver))
+            result_queue.put((keyword, product_results))
+
+        # 같은 계정의 워커들이 속도 제한과 재시도 큐를 공유
+        backend = create_fetch_backend(driver)
+        drain_search_queue(keyword_queue, backend, get_rate_limiter(account["user_id"]), on_result,
+                           label=f"[워커 {worker_no}] ")
+        backend.close()
+
+    except Exception as e:
+        print(f"[워커 {worker_no}] 실행 중 오류 발생: {e}")
+    finally:
+        driver.quit()
+
+
+def _clear_queue(q):
+    while True:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            return
+
+
+def scrape_keywords_parallel(account, keyword_dates, handle_result,
+                             concurrency=SCRAPE_CONCURRENCY, headless=HEADLESS):
+    """
+    {keyword: [검색할 날짜, ...]}를 concurrency개의 드라이버(워커 스레드)에 나눠 검색
+    결과는 호출한 스레드에서 handle_result(keyword, product_results)로 하나씩 전달되므로
+    엑셀 기록은 항상 단일 스레드에서 이루어짐
+    처리된 키워드 집합을 반환
+    """
+    keyword_queue = make_search_queue(keyword_dates)
+    concurrency = max(1, min(concurrency, len(keyword_dates)))
+
+    # 크롬을 하나도 띄우기 전에 워커 프로필을 모두 복제 (원본 프로필의 쿠키 / SQLite 파일이 사용 중이면 복제본이 깨짐)
+    # 복제에 실패한 워커는 빼고 나머지 워커로 진행
+    profiles = {}
+    for no in range(concurrency):
+        try:
+            profiles[no] = clone_profile(account["user_id"], no)
+        except (OSError, shutil.Error) as e:
+            print(f"[워커 {no}] 프로필 복제 실패로 이 워커는 실행하지 않습니다: {e}")
+
+    # 결과 처리가 밀리면 워커가 put에서 기다리도록 크기를 제한 (메모리 사용량 유지)
+    result_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    workers = [
+        threading.Thread(target=_scrape_worker, name=f"scrape-worker-{no}",
+                         args=(no, profile_name, account, keyword_queue, result_queue, headless), daemon=True)
+        for no, profile_name in profiles.items()
+    ]
+    for worker in workers:
+        worker.start()
+
+    done_keywords = set()
+    try:
+        while any(worker.is_alive() for worker in workers) or not result_queue.empty():
+            try:
+                keyword, product_results = result_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            handle_result(keyword, product_results)
+            done_keywords.add(keyword)
+    except Exception:
+        # 결과 처리에 실패하면 남은 키워드를 비우고,
+        # 워커가 가득 찬 결과 큐에서 멈추지 않도록 결과를 버리면서 워커 종료(드라이버 종료)를 기다림
+        _clear_queue(keyword_queue)
+        while any(worker.is_alive() for worker in workers):
+            _clear_queue(result_queue)
+            for worker in workers:
+                worker.join(timeout=0.1)
+        raise
+
+    missing = set(keyword_dates) - done_keywords
+    if missing:
+        print(f"처리되지 못한 키워드 {len(missing)}개: {sorted(missing)}")
+
+    return done_keywords
@@ -0,0 +1,152 @@
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from lxml import etree
+from openpyxl.utils import get_column_letter, column_index_from_string
+
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+CELL_REF_PATTERN = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+class PatchError(Exception):
+    """시트 XML을 안전하게 고칠 수 없는 경우 (openpyxl 저장으로 대체해야 함)"""
+
+
+# 패치 저장이 실패해도 원본 파일은 그대로이므로 openpyxl 전체 저장으로 대체할 수 있는 오류
+# (시트를 못 찾음 / 깨진 zip / 잘못된 XML / 잘못된 셀 주소)
+PATCH_ERRORS = (PatchError, KeyError, ValueError, zipfile.BadZipFile, etree.XMLSyntaxError)
+
+
+def _q(tag):
+    return f"{{{NS_MAIN}}}{tag}"
+
+
+def find_sheet_part(zf, sheet_name):
+    """workbook.xml과 관계 파일에서 시트 이름에 해당하는 XML 파트 경로를 찾음 (예: xl/worksheets/sheet1.xml)"""
+    workbook = etree.fromstring(zf.read("xl/workbook.xml"))
+    rel_id = None
+    for sheet in workbook.iter(_q("sheet")):
+        if sheet.get("name") == sheet_name:
+            rel_id = sheet.get(f"{{{NS_REL}}}id")
+            break
+    if rel_id is None:
+        raise PatchError(f"시트를 찾을 수 없습니다: {sheet_name}")
+
+    rels = etree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{{{NS_PKG_REL}}}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    raise PatchError(f"시트 관계를 찾을 수 없습니다: {rel_id}")
+
+
+def _set_inline_string(cell, value):
+    """셀 내용을 인라인 문자열로 교체 (스타일 s 속성은 유지)"""
+    if cell.find(_q("f")) is not None:
+        raise PatchError(f"수식 셀은 덮어쓰지 않습니다: {cell.get('r')}")
+
+    for child in list(cell):
+        cell.remove(child)
+
+    if value is None:
+        cell.attrib.pop("t", None)
+        return
+
+    cell.set("t", "inlineStr")
+    inline = etree.SubElement(cell, _q("is"))
+    text = etree.SubElement(inline, _q("t"))
+    text.text = str(value)
+    if text.text != text.text.strip():
+        text.set("{http://www.w3.org/XML/1998/namespace}space", "preserve")
+
+
+def _patch_sheet_xml(sheet_xml, updates):
+    """updates: [(row, col, value), ...]를 sheetData에 반영한 XML 바이트 반환"""
+    root = etree.fromstring(sheet_xml)
+    sheet_data = root.find(_q("sheetData"))
+    if sheet_data is None:
+        raise PatchError("sheetData가 없습니다.")
+
+    row_elements = {}
+    for row_el in sheet_data.findall(_q("row")):
+        if row_el.get("r") is None:
+            raise PatchError("행 번호(r)가 없는 행이 있습니다.")
+        row_elements[int(row_el.get("r"))] = row_el
+
+    updates_by_row = {}
+    for row, col, value in updates:
+        updates_by_row.setdefault(row, {})[col] = value
+
+    for row, col_values in updates_by_row.items():
+        row_el = row_elements.get(row)
+        if row_el is None:
+            # 행 번호 순서를 유지하며 새 행 삽입
+            row_el = etree.Element(_q("row"), r=str(row))
+            following = [r for r in row_elements if r > row]
+            if following:
+                row_elements[min(following)].addprevious(row_el)
+            else:
+                sheet_data.append(row_el)
+            row_elements[row] = row_el
+
+        # spans는 선택적 힌트라서 셀 범위가 바뀌면 제거
+        row_el.attrib.pop("spans", None)
+
+        cells = {}
+        for cell in row_el.findall(_q("c")):
+            match = CELL_REF_PATTERN.match(cell.get("r") or "")
+            if not match:
+                raise PatchError(f"셀 주소(r)를 해석할 수 없습니다: {cell.get('r')}")
+            cells[column_index_from_string(match.group(1))] = cell
+
+        for col, value in col_values.items():
+            cell = cells.get(col)
+            if cell is None:
+                # 열 순서를 유지하며 새 셀 삽입
+                cell = etree.Element(_q("c"), r=f"{get_column_letter(col)}{row}")
+                following = [c for c in cells if c > col]
+                if following:
+                    cells[min(following)].addprevious(cell)
+                else:
+                    row_el.append(cell)
+                cells[col] = cell
+            _set_inline_string(cell, value)
+
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def patch_xlsm_cells(path, sheet_name, updates, out_path=None):
+    """
+    .xlsm(zip)에서 해당 시트 XML 파트만 고쳐 쓰고, vbaProject.bin 등 나머지 파트는 그대로 복사
+    updates: [(row, col, value), ...]
+    """
+    out_path = out_path or path
+
+    with zipfile.ZipFile(path) as zin:
+        sheet_part = find_sheet_part(zin, sheet_name)
+        patched_xml = _patch_sheet_xml(zin.read(sheet_part), updates)
+
+        # 같은 폴더에 임시 파일로 쓴 뒤 교체 (중간에 실패해도 원본 유지)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(out_path)))
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, "w") as zout:
+                zout.comment = zin.comment
+                for item in zin.infolist():
+                    if item.filename == sheet_part:
+                        zout.writestr(item, patched_xml, compress_type=zipfile.ZIP_DEFLATED)
+                        continue
+                    with zin.open(item) as src, zout.open(item, "w") as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    os.replace(tmp_path, out_path)
+    print(f"시트 XML 패치 저장: {len(updates)}개 셀 ({sheet_part})")